@@ -0,0 +1,136 @@
+import argparse
+import fnmatch
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from common import days
+
+
+_solve = None  # the solve function for the current day, set in each worker process
+
+
+def init_worker(day, use_cache=False):
+    """Import the solver module once per worker process.
+
+    Each input in a batch is usually solved once, so caching its parse on disk would only cost time and space, and the
+    parsed-input cache is turned off unless `use_cache` is True.
+    """
+    global _solve
+    if not use_cache:
+        os.environ['AOC_NO_CACHE'] = '1'
+    _solve = days.load_day(day).solve
+
+
+def solve_one(input_path):
+    """Solve both parts for one input and return a JSON-serializable record of the result."""
+    start = time.perf_counter()
+    record = {'input': input_path}
+    try:
+        record['answers'] = list(_solve(input_path))
+    except Exception as exc:
+        record['error'] = f'{type(exc).__name__}: {exc}'
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+
+def to_jsonable(value):
+    """Convert values that json cannot serialize (such as numpy integers) to plain Python values."""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def list_inputs(source, pattern='*'):
+    """Return the input paths from a directory (files matching `pattern`) or a manifest file (one path per line).
+
+    Relative paths in a manifest are relative to the manifest's directory; blank lines and lines starting with '#' are
+    ignored.
+    """
+    if os.path.isdir(source):
+        names = sorted(name for name in os.listdir(source) if fnmatch.fnmatch(name, pattern))
+        return [os.path.join(source, name) for name in names if os.path.isfile(os.path.join(source, name))]
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source) as file_obj:
+        for line in file_obj:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(os.path.join(base_dir, line))
+    return paths
+
+
+def read_done(output_path, retry_errors=False):
+    """Return the set of inputs that already have a record in the output file, so a restarted run can skip them."""
+    done = set()
+    if not os.path.isfile(output_path):
+        return done
+    with open(output_path) as file_obj:
+        for line in file_obj:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if retry_errors and 'error' in record:
+                continue
+            done.add(record['input'])
+    return done
+
+
+def run_batch(day, input_paths, output_path, workers=None, chunksize=None, retry_errors=False, use_cache=False):
+    """Solve all inputs for a day over a process pool, appending a JSON line per input to the output as it finishes.
+
+    Inputs that already have a record in the output are skipped. Returns the number of inputs solved in this run. Pass
+    `use_cache` to let the workers cache parsed inputs on disk.
+    """
+    day = days.format_day(day)
+    done = read_done(output_path, retry_errors=retry_errors)
+    todo = [path for path in input_paths if path not in done]
+    if not todo:
+        return 0
+    workers = workers or os.cpu_count()
+    if chunksize is None:
+        # a few chunks per worker balances the load without too much inter-process overhead
+        chunksize = max(1, len(todo) // (workers * 4))
+
+    with open(output_path, 'a+') as out_file:
+        # if a previous run crashed part way through a line, start on a new one
+        out_file.seek(0, os.SEEK_END)
+        if out_file.tell():
+            out_file.seek(out_file.tell() - 1)
+            if out_file.read(1) != '\n':
+                out_file.write('\n')
+        with multiprocessing.Pool(workers, initializer=init_worker, initargs=(day, use_cache)) as pool:
+            for record in pool.imap_unordered(solve_one, todo, chunksize=chunksize):
+                out_file.write(json.dumps(record, default=to_jsonable) + '\n')
+                out_file.flush()
+    return len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many inputs for one day over a process pool.")
+    parser.add_argument('day', help='day to solve')
+    parser.add_argument('inputs', help='directory of inputs, or a manifest file listing one input path per line')
+    parser.add_argument('-o', '--output', default=None, help='JSONL results file (default: dayNN_results.jsonl)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes (default: cores)')
+    parser.add_argument('--chunksize', type=int, default=None, help='inputs per task sent to a worker')
+    parser.add_argument('--pattern', default='*', help='file name pattern when inputs is a directory')
+    parser.add_argument('--retry-errors', action='store_true', help='solve inputs that failed in a previous run again')
+    parser.add_argument('--cache', action='store_true', help='cache parsed inputs on disk (for inputs solved again)')
+    args = parser.parse_args()
+
+    output = args.output or f'day{days.format_day(args.day)}_results.jsonl'
+    input_paths = list_inputs(args.inputs, pattern=args.pattern)
+    start = time.perf_counter()
+    num_solved = run_batch(
+        args.day, input_paths, output, workers=args.workers, chunksize=args.chunksize, retry_errors=args.retry_errors,
+        use_cache=args.cache,
+    )
+    elapsed = time.perf_counter() - start
+    print(f'Solved {num_solved} of {len(input_paths)} inputs in {elapsed:.2f} s; results in {output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import days
+
+
+DEFAULT_SCALES = (1, 10, 100)
+
+# days whose input can be scaled up by repeating it, with the separator needed between copies
+REPLICATE_SEPARATORS = {
+    '01': '\n\n',
+    '02': '\n',
+    '03': '\n',
+    '04': '\n',
+    '10': '\n',
+    '13': '\n\n',
+    '17': '',
+}
+
+
+def make_input(day, scale, output_path, base_path=None, seed=0):
+    """Write an input for the given day at the given scale and return True, or return False if that is not possible.
+
+    Inputs come from the day's generator module if it exists; otherwise the base input is repeated `scale` times for
+    days where that results in a valid input.
+    """
+    generator = days.load_generator(day)
+    if generator is not None:
+        with open(output_path, 'w') as file_obj:
+            generator.generate(file_obj, seed=seed, **generator.scaled_knobs(scale))
+        return True
+    if base_path is None or not os.path.isfile(base_path):
+        return False
+    if scale != 1 and day not in REPLICATE_SEPARATORS:
+        return False
+    with open(base_path) as file_obj:
+        text = file_obj.read().strip('\n')
+    with open(output_path, 'w') as file_obj:
+        file_obj.write(REPLICATE_SEPARATORS.get(day, '\n').join([text] * scale) + '\n')
+    return True
+
+
+def percentile(values, fraction):
+    """Return the given percentile (as a fraction between 0 and 1) of a list of values by linear interpolation."""
+    values = sorted(values)
+    pos = fraction * (len(values) - 1)
+    low = math.floor(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def time_solver(solver, input_path, repeats):
+    """Run a solver repeatedly and return timing statistics and peak memory for one input."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        solver(input_path)
+        times.append(time.perf_counter() - start)
+
+    # measure memory in a separate run, since tracemalloc slows down allocation-heavy code
+    tracemalloc.start()
+    solver(input_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'median': statistics.median(times),
+        'p90': percentile(times, 0.9),
+        'min': min(times),
+        'max': max(times),
+        'repeats': repeats,
+        'peak_memory': peak,
+    }
+
+
+def scaling_exponent(curve):
+    """Return the slope of log(time) versus log(scale), i.e. k in time ~ scale^k, or None if it is undefined."""
+    points = [(math.log(p['scale']), math.log(p['median'])) for p in curve if p['median'] > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+def run_benchmarks(day_list, scales=DEFAULT_SCALES, repeats=5, input_dir=None, seed=0):
+    """Benchmark each part of each day at each scale and return the results as a JSON-serializable dict."""
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for day in day_list:
+            day = days.format_day(day)
+            if input_dir:
+                base_path = os.path.join(input_dir, f'day{day}_input.txt')
+            else:
+                base_path = days.input_path(day)
+            for scale in scales:
+                input_path = os.path.join(work_dir, f'day{day}_x{scale}.txt')
+                if not make_input(day, scale, input_path, base_path=base_path, seed=seed):
+                    print(f'Skipping day {day} at scale {scale}: no way to build an input', file=sys.stderr)
+                    continue
+                for part in days.PARTS:
+                    solver = days.get_solver(day, part)
+                    if solver is None:
+                        continue
+                    stats = time_solver(solver, input_path, repeats)
+                    stats['scale'] = scale
+                    stats['input_bytes'] = os.path.getsize(input_path)
+                    results.setdefault(f'{day}{part}', []).append(stats)
+                    print(f'{day}{part} x{scale}: median {stats["median"]:.4f} s', file=sys.stderr)
+                os.remove(input_path)
+    return {
+        'python': sys.version.split()[0],
+        'results': {
+            name: {'curve': curve, 'exponent': scaling_exponent(curve)} for name, curve in results.items()
+        },
+    }
+
+
+def compare_to_baseline(current, baseline, tolerance=0.25, min_delta=0.001):
+    """Return a list of messages describing benchmarks that are slower than the baseline by more than the tolerance.
+
+    Differences smaller than `min_delta` seconds are ignored, since they are mostly noise.
+    """
+    regressions = []
+    for name, entry in current['results'].items():
+        base_entry = baseline.get('results', {}).get(name)
+        if base_entry is None:
+            continue
+        base_by_scale = {p['scale']: p for p in base_entry['curve']}
+        for point in entry['curve']:
+            base_point = base_by_scale.get(point['scale'])
+            if base_point is None:
+                continue
+            limit = base_point['median'] * (1 + tolerance)
+            if point['median'] > limit and point['median'] - base_point['median'] > min_delta:
+                regressions.append(
+                    f'{name} x{point["scale"]}: median {point["median"]:.4f} s vs baseline '
+                    f'{base_point["median"]:.4f} s ({point["median"] / base_point["median"]:.2f}x)'
+                )
+    return regressions
+
+
+def format_curves(data):
+    """Return a table of median time versus scale for each part, plus the fitted scaling exponent."""
+    scales = sorted({p['scale'] for entry in data['results'].values() for p in entry['curve']})
+    header = f'{"part":>5} ' + ' '.join(f'{"x" + str(s):>10}' for s in scales) + f' {"exponent":>9} {"peak MB":>9}'
+    lines = [header]
+    for name, entry in sorted(data['results'].items()):
+        by_scale = {p['scale']: p for p in entry['curve']}
+        cells = [f'{by_scale[s]["median"]:>10.4f}' if s in by_scale else f'{"-":>10}' for s in scales]
+        exponent = f'{entry["exponent"]:>9.2f}' if entry['exponent'] is not None else f'{"-":>9}'
+        peak = max(p['peak_memory'] for p in entry['curve']) / 2 ** 20
+        lines.append(f'{name:>5} ' + ' '.join(cells) + f' {exponent} {peak:>9.1f}')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the dayNN solvers at several input sizes.')
+    parser.add_argument('days', nargs='*', help='days to benchmark (default: all)')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES), help='input size multipliers')
+    parser.add_argument('--repeats', type=int, default=5, help='timed runs per part and scale')
+    parser.add_argument('--input-dir', default=None, help='directory containing dayNN_input.txt files')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generated inputs')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='where to write the results')
+    parser.add_argument('--baseline', default=None, help='results file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed fractional slowdown vs baseline')
+    parser.add_argument('--cache', action='store_true', help='let repeated runs reuse cached parsed inputs')
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ['AOC_NO_CACHE'] = '1'
+
+    data = run_benchmarks(
+        args.days or days.list_days(), scales=args.scales, repeats=args.repeats, input_dir=args.input_dir,
+        seed=args.seed,
+    )
+    with open(args.output, 'w') as file_obj:
+        json.dump(data, file_obj, indent=2)
+    print(format_curves(data))
+
+    if args.baseline:
+        with open(args.baseline) as file_obj:
+            baseline = json.load(file_obj)
+        regressions = compare_to_baseline(data, baseline, tolerance=args.tolerance)
+        if regressions:
+            print('\nRegressions against baseline:')
+            print('\n'.join(regressions))
+            sys.exit(1)
+        print('\nNo regressions against baseline.')
+
+
+if __name__ == '__main__':
+    main()
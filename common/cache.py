@@ -0,0 +1,242 @@
+import ast
+import collections
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'aoc2022')
+COMMON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def cache_dir():
+    """Return the root directory for on-disk caches (set AOC_CACHE_DIR to override it)."""
+    return os.environ.get('AOC_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+
+def caching_enabled():
+    """Return False if caching has been turned off by setting AOC_NO_CACHE."""
+    return not os.environ.get('AOC_NO_CACHE')
+
+
+def file_digest(path, block_size=1 << 20):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file_obj:
+        for block in iter(lambda: file_obj.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(source_path):
+    """Return the SHA-256 hex digest of a source file, so cached values are invalidated when the code changes."""
+    return file_digest(source_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _common_imports(source_path):
+    """Return the paths of the modules in this package that a source file imports at the top level."""
+    with open(source_path) as file_obj:
+        tree = ast.parse(file_obj.read(), filename=source_path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module == 'common':
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('common.'):
+            names.append(node.module.split('.')[1])
+        elif isinstance(node, ast.Import):
+            names += [alias.name.split('.')[1] for alias in node.names if alias.name.startswith('common.')]
+    paths = [os.path.join(COMMON_DIR, f'{name}.py') for name in names]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+@functools.lru_cache(maxsize=None)
+def solver_digest(source_path):
+    """Return a digest of a solver's source and of every module in this package that it uses, directly or not.
+
+    Editing a day's module, or a shared module that it imports, changes only that day's digest.
+    """
+    source_path = os.path.abspath(source_path)
+    found = {source_path}
+    todo = [source_path]
+    while todo:
+        for path in _common_imports(todo.pop()):
+            if path not in found:
+                found.add(path)
+                todo.append(path)
+    digest = hashlib.sha256()
+    for path in sorted(found):
+        digest.update(f'{os.path.basename(path)}:{source_digest(path)}\n'.encode())
+    return digest.hexdigest()
+
+
+def _iter_arrays(value):
+    """Yield the numpy arrays in a value, at the top level or inside tuples and lists, in a fixed order."""
+    if hasattr(value, 'setflags') and hasattr(value, 'flags'):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _iter_arrays(item)
+
+
+class InputCache:
+    """Two-tier cache of values derived from input files: an LRU dict in memory backed by pickle files on disk.
+
+    Values are shared between callers, so they must be treated as read-only. Pickling drops the read-only flag of
+    numpy arrays, so it is saved alongside the value and set again when the value is loaded from disk.
+    """
+
+    disk_format = 2  # part of the file names, so that files written in an older layout are never read
+
+    def __init__(self, name, max_entries=16, max_disk_entries=256):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.entries = collections.OrderedDict()
+
+    def _disk_dir(self):
+        return os.path.join(cache_dir(), self.name)
+
+    def _disk_path(self, key):
+        return os.path.join(self._disk_dir(), f'{key}.v{self.disk_format}.pickle')
+
+    def get(self, key):
+        """Return (True, value) if the key is cached in memory or on disk, otherwise (False, None)."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return True, self.entries[key]
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as file_obj:
+                value, read_only = pickle.load(file_obj)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False, None
+        for array, array_read_only in zip(_iter_arrays(value), read_only):
+            if array_read_only:
+                array.setflags(write=False)
+        try:
+            os.utime(path)  # mark as recently used for disk eviction
+        except OSError:
+            pass  # another process evicted it after it was read, which does not matter here
+        self._put_memory(key, value)
+        return True, value
+
+    def put(self, key, value):
+        """Store a value in memory and, if it can be pickled, on disk."""
+        self._put_memory(key, value)
+        try:
+            read_only = [not array.flags.writeable for array in _iter_arrays(value)]
+            data = pickle.dumps((value, read_only), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            return  # some values (e.g. very deep object graphs) can only be cached in memory
+        # the disk tier is only an optimization, so failing to write to it (e.g. a full disk) must not fail the caller
+        try:
+            disk_dir = self._disk_dir()
+            os.makedirs(disk_dir, exist_ok=True)
+            # write to a temporary file first so that other processes never see a partial pickle
+            fd, tmp_path = tempfile.mkstemp(dir=disk_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file_obj:
+                    file_obj.write(data)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError:
+                os.remove(tmp_path)
+                raise
+            self._evict_disk()
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove all entries from memory and disk."""
+        self.entries.clear()
+        disk_dir = self._disk_dir()
+        if os.path.isdir(disk_dir):
+            for name in os.listdir(disk_dir):
+                os.remove(os.path.join(disk_dir, name))
+
+    def _put_memory(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _evict_disk(self):
+        disk_dir = self._disk_dir()
+        paths = [os.path.join(disk_dir, name) for name in os.listdir(disk_dir) if name.endswith('.pickle')]
+        if len(paths) <= self.max_disk_entries:
+            return
+        # other processes evict from the same directory, so files can vanish between listing and reading their times
+        mtimes = {}
+        for path in paths:
+            try:
+                mtimes[path] = os.path.getmtime(path)
+            except OSError:
+                pass
+        paths = sorted(mtimes, key=mtimes.get)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # another process may have removed it already
+
+
+parsed_inputs = InputCache('parsed')
+
+
+def cached_input(func):
+    """Cache the return value of a function whose only argument is an input path.
+
+    The cache key is the function, the absolute input path, the input file's contents and the source of the module
+    that defines the function and of the shared modules it uses (see solver_digest), so editing either the input or the
+    code invalidates the entry. Set AOC_NO_CACHE to bypass the cache.
+    """
+
+    @functools.wraps(func)
+    def wrapper(input_path):
+        if not caching_enabled():
+            return func(input_path)
+        parts = [
+            func.__module__,
+            func.__qualname__,
+            solver_digest(func.__code__.co_filename),
+            os.path.abspath(input_path),
+            file_digest(input_path),
+        ]
+        key = hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+        found, value = parsed_inputs.get(key)
+        if not found:
+            value = func(input_path)
+            parsed_inputs.put(key, value)
+        return value
+
+    return wrapper
+
+
+solved_results = InputCache('results', max_entries=256, max_disk_entries=4096)
+
+
+def _result_key(day, part, solver_path, input_path):
+    parts = [day, part, solver_digest(solver_path), file_digest(input_path)]
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()
+
+
+def get_result(day, part, solver_path, input_path):
+    """Return (True, answer) if an answer for this day, part, solver source and input content is cached.
+
+    `solver_path` is the day's module file. Returns (False, None) if there is no answer or caching is turned off.
+    """
+    if not caching_enabled():
+        return False, None
+    return solved_results.get(_result_key(day, part, solver_path, input_path))
+
+
+def put_result(day, part, solver_path, input_path, answer):
+    """Cache an answer for this day, part, solver source and input content."""
+    if not caching_enabled():
+        return
+    if hasattr(answer, 'item'):
+        answer = answer.item()  # store numpy integers as plain ints, so reading them back does not need numpy
+    solved_results.put(_result_key(day, part, solver_path, input_path), answer)
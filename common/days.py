@@ -0,0 +1,76 @@
+import importlib.util
+import os
+import re
+import sys
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_DIR_PATTERN = re.compile(r'^day(\d\d)$')
+PARTS = ('a', 'b')
+
+_modules = {}
+
+
+def list_days():
+    """Return a sorted list of two-digit day strings (e.g. '07') that have a solver module."""
+    days = []
+    for name in os.listdir(REPO_DIR):
+        match = DAY_DIR_PATTERN.match(name)
+        if match and os.path.isfile(module_path(match.group(1))):
+            days.append(match.group(1))
+    return sorted(days)
+
+
+def format_day(day):
+    """Return the two-digit string for a day given as an int or string."""
+    return f'{int(day):02d}'
+
+
+def module_path(day):
+    """Return the path to the solver module for the given day."""
+    day = format_day(day)
+    return os.path.join(REPO_DIR, f'day{day}', f'day{day}.py')
+
+
+def input_path(day):
+    """Return the path to the puzzle input for the given day (which may not exist)."""
+    day = format_day(day)
+    return os.path.join(REPO_DIR, f'day{day}', f'day{day}_input.txt')
+
+
+def load_day(day):
+    """Import and return the solver module for the given day, reusing it if it was already imported."""
+    day = format_day(day)
+    if day not in _modules:
+        spec = importlib.util.spec_from_file_location(f'day{day}', module_path(day))
+        module = importlib.util.module_from_spec(spec)
+        # register the module so that objects defined in it can be pickled
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _modules[day] = module
+    return _modules[day]
+
+
+def generator_path(day):
+    """Return the path to the input generator module for the given day (which may not exist)."""
+    day = format_day(day)
+    return os.path.join(REPO_DIR, f'day{day}', f'day{day}_generator.py')
+
+
+def load_generator(day):
+    """Import and return the input generator module for the given day, or return None if there is none."""
+    path = generator_path(day)
+    if not os.path.isfile(path):
+        return None
+    spec = importlib.util.spec_from_file_location(f'day{format_day(day)}_generator', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_solver(day, part):
+    """Return the dayNNa or dayNNb function for the given day and part, or None if it does not exist."""
+    if part not in PARTS:
+        raise ValueError(f"Part must be one of {PARTS} but got '{part}'.")
+    day = format_day(day)
+    return getattr(load_day(day), f'day{day}{part}', None)
@@ -0,0 +1,96 @@
+import functools
+
+import numpy as np
+
+
+def from_text(data):
+    """Return a 2-D uint8 array of the characters in text made of equal-length lines (bytes, str or uint8 array).
+
+    Line endings and trailing blank lines are dropped, so each cell holds the byte value of one character.
+    """
+    lines = bytes(data.encode() if isinstance(data, str) else data).replace(b'\r', b'').strip(b'\n').split(b'\n')
+    return np.frombuffer(b''.join(lines), np.uint8).reshape(len(lines), -1).copy()
+
+
+def read_text(input_path):
+    """Return a 2-D uint8 array of the characters in a file made of equal-length lines."""
+    with open(input_path, 'rb') as file_obj:
+        return from_text(file_obj.read())
+
+
+def to_text(array, symbols):
+    """Return a 2-D array of small integer codes as lines of text, drawing code i as the character symbols[i]."""
+    chars = np.frombuffer(symbols.encode(), np.uint8)[array]
+    return '\n'.join(row.tobytes().decode() for row in chars)
+
+
+def pad(array, width=1, value=0):
+    """Return a copy of an array with a border of `width` cells set to `value` on every side."""
+    return np.pad(array, width, 'constant', constant_values=value)
+
+
+@functools.lru_cache(maxsize=None)
+def neighbour_offsets(shape):
+    """Return the flat-index offsets of the neighbours one step away along each axis of a C-ordered array.
+
+    For a 2-D array the order is up, down, left, right; in general it is minus then plus one step along each axis in
+    turn. Adding an offset to a flat index only stays in the grid if the cell is not on the border, so grids that are
+    walked this way are usually padded first.
+    """
+    strides = [int(np.prod(shape[axis + 1:], dtype=np.int64)) for axis in range(len(shape))]
+    return tuple(sign * stride for stride in strides for sign in (-1, 1))
+
+
+def flat_offsets(coords, shape):
+    """Return the flat-index offsets for a sequence of relative coordinates (e.g. the cells of a shape) in an array."""
+    strides = [int(np.prod(shape[axis + 1:], dtype=np.int64)) for axis in range(len(shape))]
+    return tuple(sum(c * stride for c, stride in zip(coord, strides)) for coord in coords)
+
+
+def flat_index(coords, shape):
+    """Return the flat index of a cell as an int, or an array of flat indices for an NxD array of cells."""
+    index = np.ravel_multi_index(tuple(np.asarray(coords).T), shape)
+    return int(index) if np.ndim(index) == 0 else index
+
+
+def shift(array, offset, fill=0):
+    """Return an array of the same shape with the contents moved by `offset` cells along each axis.
+
+    Cells moved in from outside the array are set to `fill`; nothing wraps around, unlike np.roll.
+    """
+    result = np.full_like(array, fill)
+    src = []
+    dst = []
+    for step, size in zip(offset, array.shape):
+        if abs(step) >= size:
+            return result
+        src.append(slice(max(-step, 0), size - max(step, 0)))
+        dst.append(slice(max(step, 0), size - max(-step, 0)))
+    result[tuple(dst)] = array[tuple(src)]
+    return result
+
+
+def occupancy(coords, pad_width=1):
+    """Return a boolean array marking the cells in an NxD integer array of coordinates, and the coordinate origin.
+
+    The array covers the bounding box of the coordinates plus a border of `pad_width` empty cells, and cell `c` is at
+    index `c - origin`.
+    """
+    coords = np.asarray(coords)
+    origin = coords.min(axis=0) - pad_width
+    shape = coords.max(axis=0) - origin + 1 + pad_width
+    grid = np.zeros(shape, bool)
+    grid[tuple((coords - origin).T)] = True
+    return grid, origin
+
+
+def count_adjacent_pairs(mask):
+    """Return the number of pairs of True cells that are next to each other along any axis of a boolean array."""
+    total = 0
+    for axis in range(mask.ndim):
+        lower = [slice(None)] * mask.ndim
+        upper = [slice(None)] * mask.ndim
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        total += int(np.count_nonzero(mask[tuple(lower)] & mask[tuple(upper)]))
+    return total
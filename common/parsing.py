@@ -0,0 +1,178 @@
+import contextlib
+import itertools
+import mmap
+import os
+import sys
+
+import numpy as np
+
+
+def read_bytes(input_path, use_mmap=False):
+    """Return the contents of a file as a uint8 array, optionally memory-mapped instead of read into memory."""
+    with open(input_path, 'rb') as file_obj:
+        if not use_mmap:
+            return np.frombuffer(file_obj.read(), np.uint8)
+        try:
+            mapped = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return np.zeros(0, np.uint8)
+    # the array keeps a reference to the map, so it stays valid after the file is closed
+    return np.frombuffer(mapped, np.uint8)
+
+
+def as_byte_array(data):
+    """Return bytes, a str or a uint8 array as a uint8 array."""
+    if isinstance(data, np.ndarray):
+        return data
+    if isinstance(data, str):
+        data = data.encode()
+    return np.frombuffer(data, np.uint8)
+
+
+def find_digit_runs(data):
+    """Return arrays of the start and end (exclusive) positions of each run of decimal digits in a uint8 array."""
+    is_digit = (data >= ord('0')) & (data <= ord('9'))
+    padded = np.concatenate(([False], is_digit, [False]))
+    changes = np.flatnonzero(padded[1:] != padded[:-1])
+    return changes[::2], changes[1::2]
+
+
+def extract_ints(data, signed=True, return_starts=False):
+    """Return every integer in a buffer as an int64 array, in the order they appear.
+
+    Args:
+        data: bytes, str or uint8 array to search
+        signed: optional bool; if True, a '-' directly before a number makes it negative; set it to False when '-' is
+            used as a separator (e.g. '2-4'); defaults to True
+        return_starts: optional bool; if True, also return the position of the first digit of each integer
+
+    Returns:
+        int64 array of integers, or tuple(integers, starts) if return_starts is True
+    """
+    data = as_byte_array(data)
+    starts, ends = find_digit_runs(data)
+    if not len(starts):
+        values = np.zeros(0, np.int64)
+        return (values, starts) if return_starts else values
+
+    # Horner's rule, one digit position at a time for all runs at once: numbers are short, so this takes a few passes
+    # over the runs instead of building several arrays with an entry per digit
+    lengths = ends - starts
+    values = np.zeros(len(starts), np.int64)
+    last = len(data) - 1
+    for pos in range(int(lengths.max())):
+        digits = data[np.minimum(starts + pos, last)].astype(np.int64) - ord('0')
+        values = np.where(lengths > pos, values * 10 + digits, values)
+
+    if signed:
+        negative = np.zeros(len(starts), bool)
+        has_prev = starts > 0
+        negative[has_prev] = data[starts[has_prev] - 1] == ord('-')
+        values[negative] *= -1
+    return (values, starts) if return_starts else values
+
+
+def read_ints(input_path, signed=True, use_mmap=False):
+    """Return every integer in a file as an int64 array, in the order they appear."""
+    return extract_ints(read_bytes(input_path, use_mmap=use_mmap), signed=signed)
+
+
+def read_int_lines(input_path, signed=True, use_mmap=False):
+    """Return a list with an int64 array of the integers on each line of a file, skipping lines with no integers."""
+    data = read_bytes(input_path, use_mmap=use_mmap)
+    values, starts = extract_ints(data, signed=signed, return_starts=True)
+    if not len(values):
+        return []
+    line_inds = np.searchsorted(np.flatnonzero(data == ord('\n')), starts)
+    counts = np.bincount(line_inds)
+    counts = counts[counts > 0]
+    return np.split(values, np.cumsum(counts)[:-1])
+
+
+def line_starts(data):
+    """Return the positions of the first character of each non-empty line in a uint8 array."""
+    starts = np.concatenate(([0], np.flatnonzero(data == ord('\n')) + 1))
+    starts = starts[starts < len(data)]
+    return starts[~np.isin(data[starts], np.frombuffer(b'\n\r', np.uint8))]
+
+
+def line_bounds(data):
+    """Return arrays of the start and end (exclusive, before any line ending) of each non-empty line in a uint8 array.
+
+    A line ending is a newline, optionally preceded by a carriage return.
+    """
+    starts = line_starts(data)
+    newlines = np.flatnonzero(data == ord('\n'))
+    ends = np.append(newlines, len(data))[np.searchsorted(newlines, starts)]
+    ends -= data[ends - 1] == ord('\r')
+    return starts, ends
+
+
+def is_path(source):
+    """Return True if an input source is a file path (as opposed to '-' for stdin, a file object or lines)."""
+    return isinstance(source, (str, bytes, os.PathLike)) and source not in ('-', b'-')
+
+
+def _decode_lines(lines):
+    for line in lines:
+        yield line.decode() if isinstance(line, bytes) else line
+
+
+@contextlib.contextmanager
+def open_lines(source):
+    """Return a context manager giving an iterator over the lines of an input source.
+
+    The source can be a file path, '-' for stdin, an open file object (text or binary) or any iterable of lines.
+    Lines are read lazily, so memory use does not depend on the size of the input.
+    """
+    if is_path(source):
+        with open(source) as file_obj:
+            yield file_obj
+    elif source in ('-', b'-'):
+        yield sys.stdin
+    else:
+        yield _decode_lines(source)
+
+
+def iter_line_chunks(source, chunk_lines=65536):
+    """Yield strings of up to `chunk_lines` whole lines (each ending in a newline) from an input source."""
+    with open_lines(source) as lines:
+        while True:
+            batch = list(itertools.islice(lines, chunk_lines))
+            if not batch:
+                return
+            yield ''.join(line if line.endswith('\n') else line + '\n' for line in batch)
+
+
+def _next_line_end(data, pos, window=4096):
+    """Return the position just after the first newline at or after `pos` in a uint8 array (or its length)."""
+    while pos < len(data):
+        found = np.flatnonzero(data[pos:pos + window] == ord('\n'))
+        if len(found):
+            return pos + int(found[0]) + 1
+        pos += window
+    return len(data)
+
+
+def iter_byte_chunks(source, chunk_size=1 << 22):
+    """Yield uint8 arrays of whole lines, about `chunk_size` bytes at a time, from an input source.
+
+    Files are memory-mapped, so only the chunk being worked on needs to be in memory; other sources are read a batch of
+    lines at a time.
+    """
+    if is_path(source):
+        data = read_bytes(source, use_mmap=True)
+        start = 0
+        while start < len(data):
+            end = _next_line_end(data, start + chunk_size - 1)
+            yield data[start:end]
+            start = end
+    else:
+        for chunk in iter_line_chunks(source):
+            yield as_byte_array(chunk)
+
+
+def iter_int_chunks(source, num_cols, signed=True, chunk_size=1 << 22):
+    """Yield arrays of shape (n, num_cols) with the integers on each line of an input source, a chunk at a time."""
+    for data in iter_byte_chunks(source, chunk_size=chunk_size):
+        yield extract_ints(data, signed=signed).reshape(-1, num_cols)
@@ -0,0 +1,183 @@
+import atexit
+import contextlib
+import cProfile
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+
+_enabled = False
+_track_memory = False
+_cprofile_phase = None  # name of the phase to capture with cProfile, if any
+_profiler = None
+_stats = {}  # phase name --> {'calls': int, 'wall': float, 'peak_memory': int}
+_stack = []  # phases in progress, innermost last
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+def enable(memory=True, cprofile_phase=None):
+    """Start collecting phase statistics, optionally with peak memory and a cProfile of one phase."""
+    global _enabled, _track_memory, _cprofile_phase, _profiler
+    _enabled = True
+    _track_memory = memory
+    _cprofile_phase = cprofile_phase
+    _profiler = cProfile.Profile() if cprofile_phase else None
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """Stop collecting phase statistics."""
+    global _enabled
+    _enabled = False
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget all statistics collected so far."""
+    global _profiler
+    _stats.clear()
+    if _profiler is not None:
+        _profiler = cProfile.Profile()
+
+
+def get_stats():
+    """Return a copy of the statistics collected so far."""
+    return {name: dict(entry) for name, entry in _stats.items()}
+
+
+def merge_stats(total, stats):
+    """Add the statistics in `stats` (e.g. from another process) to `total` and return it."""
+    for name, entry in stats.items():
+        if name not in total:
+            total[name] = dict(entry)
+            continue
+        total[name]['calls'] += entry['calls']
+        total[name]['wall'] += entry['wall']
+        total[name]['peak_memory'] = max(total[name]['peak_memory'], entry['peak_memory'])
+    return total
+
+
+class _Phase:
+    """Context manager that records wall time, calls and peak memory for one execution of a phase."""
+
+    def __init__(self, name, short_name):
+        self.name = name
+        self.short_name = short_name
+        self.start_memory = 0
+        self.inner_peak = 0  # highest traced memory seen before any reset of the peak inside this phase
+        self.profiling = False
+        self.start = None
+
+    def __enter__(self):
+        if _track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:
+                # resetting the peak below would lose the enclosing phase's peak so far, so save it there first
+                _stack[-1].inner_peak = max(_stack[-1].inner_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+            self.inner_peak = current
+        _stack.append(self)
+        if _profiler is not None and _cprofile_phase in (self.name, self.short_name):
+            self.profiling = True
+            _profiler.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.start
+        if self.profiling:
+            _profiler.disable()
+        _stack.pop()
+        peak = 0
+        if _track_memory:
+            peak = max(tracemalloc.get_traced_memory()[1], self.inner_peak) - self.start_memory
+        entry = _stats.setdefault(self.name, {'calls': 0, 'wall': 0.0, 'peak_memory': 0})
+        entry['calls'] += 1
+        entry['wall'] += wall
+        entry['peak_memory'] = max(entry['peak_memory'], peak)
+        return False
+
+
+def phase(name):
+    """Return a context manager that records a block of code as the named phase (does nothing when disabled)."""
+    if not _enabled:
+        return _NULL_CONTEXT
+    return _Phase(name, name.rsplit('.', 1)[-1])
+
+
+def timed(phase_name):
+    """Decorate a function so each call is recorded as a phase, e.g. 'parse', 'precompute' or 'solve'.
+
+    Statistics are kept under '<module file name>.<phase_name>', e.g. 'day14.parse'. When profiling is disabled, the
+    only overhead is one extra function call and a flag check.
+    """
+
+    def decorator(func):
+        # look through other decorators (e.g. cached_input) for the module that defines the function
+        source_file = inspect.unwrap(func).__code__.co_filename
+        module_name = os.path.splitext(os.path.basename(source_file))[0]
+        name = f'{module_name}.{phase_name}'
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Phase(name, phase_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def format_report(stats=None):
+    """Return a table of the collected (or given) statistics as a string."""
+    stats = get_stats() if stats is None else stats
+    lines = [f'{"phase":<24} {"calls":>8} {"wall (s)":>10} {"per call (ms)":>14} {"peak MB":>9}']
+    for name, entry in sorted(stats.items()):
+        per_call = 1000 * entry['wall'] / entry['calls']
+        peak = entry['peak_memory'] / 2 ** 20
+        lines.append(f'{name:<24} {entry["calls"]:>8} {entry["wall"]:>10.4f} {per_call:>14.3f} {peak:>9.2f}')
+    return '\n'.join(lines)
+
+
+def dump(path, stats=None):
+    """Write the collected (or given) statistics to a JSON file."""
+    stats = get_stats() if stats is None else stats
+    with open(path, 'w') as file_obj:
+        json.dump(stats, file_obj, indent=2, sort_keys=True)
+
+
+def dump_cprofile(path):
+    """Write the cProfile data for the captured phase to a file that pstats can read, if there is any."""
+    if _profiler is not None:
+        _profiler.dump_stats(path)
+
+
+def _report_at_exit():
+    print(format_report(), file=sys.stderr)
+    if os.environ.get('AOC_PROFILE_JSON'):
+        dump(os.environ['AOC_PROFILE_JSON'])
+    if os.environ.get('AOC_PROFILE_CPROFILE_OUT'):
+        dump_cprofile(os.environ['AOC_PROFILE_CPROFILE_OUT'])
+
+
+# profiling can be turned on for any script with environment variables, e.g.
+#   AOC_PROFILE=1 AOC_PROFILE_CPROFILE=solve AOC_PROFILE_CPROFILE_OUT=solve.prof python day14.py
+if os.environ.get('AOC_PROFILE'):
+    enable(
+        memory=os.environ.get('AOC_PROFILE_MEMORY', '1') != '0',
+        cprofile_phase=os.environ.get('AOC_PROFILE_CPROFILE') or None,
+    )
+    atexit.register(_report_at_exit)
@@ -1,53 +1,234 @@
+import array
+import concurrent.futures
+import heapq
+import mmap
+import os
+import sys
 
+import numpy as np
 
-def day01a(input_path):
-    """Return the maximum total number of calories carried by a single elf."""
-    max_elf = 0
-    with open(input_path) as file_obj:
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+
+
+def iter_elf_totals(input_path):
+    """Yield the total calories carried by each elf, in the order they appear in the input.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    with parsing.open_lines(input_path) as lines:
         this_elf = 0
-        for line in file_obj:
+        has_items = False
+        for line in lines:
             val = line.strip()
             if val:
                 this_elf += int(val)
-            else:
-                if this_elf > max_elf:
-                    max_elf = this_elf
+                has_items = True
+            elif has_items:
+                yield this_elf
                 this_elf = 0
-    if this_elf > max_elf:
-        max_elf = this_elf
-    return max_elf
+                has_items = False
+    if has_items:
+        yield this_elf
+
+
+def chunk_elf_totals(data):
+    """Return an int64 array of the elf totals in a uint8 array holding whole elves."""
+    if np.any(data == ord('\r')):
+        data = data[data != ord('\r')]
+    values, starts = parsing.extract_ints(data, signed=False, return_starts=True)
+    if not len(values):
+        return np.zeros(0, np.int64)
+    # an elf ends at each blank line, i.e. where two newlines are next to each other
+    newlines = data == ord('\n')
+    elf_ends = np.flatnonzero(newlines[1:] & newlines[:-1]) + 1
+    elf_ids = np.searchsorted(elf_ends, starts)
+    first_of_elf = np.flatnonzero(np.diff(elf_ids, prepend=-1))  # elf_ids never decreases
+    return np.add.reduceat(values, first_of_elf)
+
+
+def chunk_bounds(input_path, chunk_size):
+    """Return a list of (start, end) byte ranges of roughly `chunk_size` that split a file between elves."""
+    with open(input_path, 'rb') as file_obj:
+        size = os.fstat(file_obj.fileno()).st_size
+        if size <= chunk_size:
+            return [(0, size)]
+        with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            bounds = [0]
+            while bounds[-1] < size:
+                pos = bounds[-1] + chunk_size
+                if pos >= size:
+                    bounds.append(size)
+                    break
+                # move the split forward to the end of the next line that is followed by a blank line
+                end = mapped.find(b'\n', pos)
+                while end >= 0 and mapped[end + 1:end + 2] not in (b'\n', b'\r'):
+                    end = mapped.find(b'\n', end + 1)
+                bounds.append(size if end < 0 else end + 1)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def reduce_chunk(input_path, start, end, k, keep_totals):
+    """Return a CalorieTally of the elves in one byte range of a file."""
+    data = parsing.read_bytes(input_path, use_mmap=True)[start:end]
+    tally = CalorieTally(k=k, keep_totals=keep_totals)
+    tally.update(chunk_elf_totals(data))
+    return tally
+
+
+class CalorieTally:
+    """Keeps the top k calorie totals (and optionally every total) seen in a single pass over the elves.
+
+    The top k are kept in a min-heap of size k, so adding n elves takes O(n log k) time and O(k) memory, and nothing is
+    ever sorted except the k totals returned by top(). rank() and percentile() need every total, so they only work if
+    `keep_totals` is True.
+    """
+
+    def __init__(self, k=3, keep_totals=False):
+        if k < 1:
+            raise ValueError(f'k must be at least 1 but got {k}.')
+        self.k = k
+        self.heap = []  # the largest k totals so far, smallest first
+        self.num_elves = 0
+        self.totals = array.array('q') if keep_totals else None
+
+    @classmethod
+    @profiling.timed('solve')
+    def from_input(cls, input_path, k=3, keep_totals=False, workers=None, chunk_size=4 << 20):
+        """Return a tally of every elf in the input.
+
+        By default the input is read a line at a time, so it can be any source that open_lines accepts. For large
+        files, pass `workers` to split the (memory-mapped) file into chunks of about `chunk_size` bytes at blank lines
+        and tally each chunk with numpy, in this process if workers is 1 or in a pool of worker processes otherwise.
+        """
+        tally = cls(k=k, keep_totals=keep_totals)
+        if workers is None:
+            for total in iter_elf_totals(input_path):
+                tally.add(total)
+            return tally
+
+        bounds = chunk_bounds(input_path, chunk_size)
+        if workers == 1 or len(bounds) == 1:
+            chunk_tallies = (reduce_chunk(input_path, start, end, k, keep_totals) for start, end in bounds)
+            for chunk_tally in chunk_tallies:
+                tally.merge(chunk_tally)
+            return tally
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(reduce_chunk, input_path, start, end, k, keep_totals) for start, end in bounds]
+            # merge in file order, so that the stored totals stay in input order
+            for future in futures:
+                tally.merge(future.result())
+        return tally
+
+    def add(self, total):
+        """Count one more elf carrying `total` calories."""
+        self.num_elves += 1
+        if self.totals is not None:
+            self.totals.append(total)
+        self._push(total)
+
+    def _push(self, total):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, total)
+        elif total > self.heap[0]:
+            heapq.heapreplace(self.heap, total)
+
+    def update(self, totals):
+        """Count a batch of elves from an array of their totals."""
+        totals = np.asarray(totals, np.int64)
+        self.num_elves += len(totals)
+        if self.totals is not None:
+            self.totals.frombytes(totals.tobytes())
+        if len(totals) > self.k:
+            totals = np.partition(totals, -self.k)[-self.k:]  # only the largest k can end up in the heap
+        for total in totals.tolist():
+            self._push(total)
+
+    def merge(self, other):
+        """Add the elves counted by another tally (e.g. of another part of the same input) to this one."""
+        self.num_elves += other.num_elves
+        if self.totals is not None:
+            self.totals.extend(other.totals)
+        for total in other.heap:
+            self._push(total)
+
+    def top(self, k=None):
+        """Return the largest k totals (default: the k given when creating the tally) in decreasing order."""
+        k = self.k if k is None else k
+        if k > self.k:
+            raise ValueError(f'This tally only keeps the top {self.k} totals but {k} were requested.')
+        return sorted(self.heap, reverse=True)[:k]
+
+    def _all_totals(self):
+        if self.totals is None:
+            raise ValueError('Create the tally with keep_totals=True to query ranks and percentiles.')
+        return np.frombuffer(self.totals, np.int64)
+
+    def rank(self, total):
+        """Return the rank an elf carrying `total` calories would have, where the elf carrying the most has rank 1."""
+        return 1 + int(np.count_nonzero(self._all_totals() > total))
+
+    def percentile(self, q):
+        """Return the total calories at percentile q (from 0 to 100) of all elves."""
+        return float(np.percentile(self._all_totals(), q))
+
+
+def day01a(input_path, workers=None):
+    """Return the maximum total number of calories carried by a single elf.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines. For very large files, pass
+    `workers` to tally chunks of the file in parallel (see CalorieTally.from_input).
+    """
+    top = CalorieTally.from_input(input_path, k=1, workers=workers).top()
+    return top[0] if top else 0
 
 
 def test01a():
     assert 24000 == day01a('test_input.txt')
 
 
-def day01b(input_path):
+def day01b(input_path, workers=None):
     """Return the sum of the top three maximum total calories carried by individual elves."""
-    max_elves = [0, 0, 0]
-    with open(input_path) as file_obj:
-        this_elf = 0
-        for line in file_obj:
-            val = line.strip()
-            if val:
-                this_elf += int(val)
-            else:
-                if this_elf > max_elves[0]:
-                    max_elves[0] = this_elf
-                    max_elves = sorted(max_elves)
-                this_elf = 0
-    if this_elf > max_elves[0]:
-        max_elves[0] = this_elf
-        max_elves = sorted(max_elves)
-    return sum(max_elves)
+    return sum(CalorieTally.from_input(input_path, k=3, workers=workers).top())
 
 
 def test01b():
     assert 45000 == day01b('test_input.txt')
 
 
+def test_tally():
+    tally = CalorieTally.from_input('test_input.txt', k=4, keep_totals=True)
+    assert [24000, 11000, 10000, 6000] == tally.top()
+    assert [24000, 11000] == tally.top(2)
+    assert 5 == tally.num_elves
+    assert 1 == tally.rank(24000)
+    assert 3 == tally.rank(10000)
+    assert 10000 == tally.percentile(50)
+
+
+def test_tally_chunks():
+    # tiny chunks, so that the test input is split between several workers
+    for workers in (1, 2):
+        tally = CalorieTally.from_input('test_input.txt', k=4, keep_totals=True, workers=workers, chunk_size=8)
+        assert [24000, 11000, 10000, 6000] == tally.top()
+        assert [6000, 4000, 11000, 24000, 10000] == list(tally.totals)
+
+
+def solve(input_path, workers=None):
+    """Return the answers to both parts from a single pass over the input."""
+    top = CalorieTally.from_input(input_path, k=3, workers=workers).top()
+    return (top[0] if top else 0), sum(top)
+
+
+def test_solve():
+    assert (24000, 45000) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test01a()
     print('Day 01a:', day01a('day01_input.txt'))
     test01b()
+    test_tally()
+    test_tally_chunks()
+    test_solve()
     print('Day 01b:', day01b('day01_input.txt'))
@@ -0,0 +1,16 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_elves': 250 * scale}
+
+
+def generate(file_obj, seed=0, num_elves=250, max_items=15, min_calories=1000, max_calories=60000):
+    """Write a calorie inventory: one group of calorie counts per elf, with a blank line between elves."""
+    rng = random.Random(seed)
+    for ind in range(num_elves):
+        if ind:
+            file_obj.write('\n')
+        for _ in range(rng.randint(1, max_items)):
+            file_obj.write(f'{rng.randint(min_calories, max_calories)}\n')
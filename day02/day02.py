@@ -1,28 +1,57 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
 
 
 def day02a(input_path):
-    """Return my total score from following the strategy guide, I think."""
-    with open(input_path) as file_obj:
-        total = 0
-        for line in file_obj:
-            score = 0
-            moves = [ord(move) for move in line.strip().split()]
-            yours, mine = moves
-            yours -= 64  # A --> 1, B --> 2, C --> 3
-            mine -= 87  # X --> 1, Y --> 2, Z --> 3
-            # A means opponent will play rock, Y paper, Z scissors
-            # X means I should play rock, Y paper, Z scissors
-            score += mine  # shape points
-            offset = (yours - mine) % 3
-            if offset == 0:
-                outcome_points = 3  # draw
-            elif offset == 1:
-                outcome_points = 0  # lose
-            else:
-                outcome_points = 6  # win
-            score += outcome_points
-            total += score
-    return total
+    """Return my total score from following the strategy guide, I think.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    return int(np.sum(count_rounds(input_path) * SCORES_A))
+
+
+INVALID_GUIDE = 'The strategy guide should only contain A, B or C followed by X, Y or Z on each line.'
+
+
+@profiling.timed('solve')
+def count_rounds(input_path):
+    """Return a 3x3 array of how many rounds there are of each combination of letters (rows A-C, columns X-Z)."""
+    counts = np.zeros(9, np.int64)
+    carry = np.zeros(0, np.uint8)  # a letter left over at the end of a block (only if a line is missing one)
+    for block in parsing.iter_byte_chunks(input_path, chunk_size=1 << 24):
+        letters = np.concatenate((carry, block[block > ord(' ')]))  # drop spaces and line endings
+        num_letters = len(letters) - len(letters) % 2
+        pairs = letters[:num_letters].reshape(-1, 2)
+        carry = letters[num_letters:]
+        # widen before subtracting, so that a byte other than A-C or X-Z cannot wrap around into a valid bin
+        yours = pairs[:, 0].astype(np.int16) - ord('A')
+        mine = pairs[:, 1].astype(np.int16) - ord('X')
+        if np.any((yours < 0) | (yours > 2) | (mine < 0) | (mine > 2)):
+            raise ValueError(INVALID_GUIDE)
+        counts += np.bincount(yours * 3 + mine, minlength=9)
+    if len(carry):
+        raise ValueError(INVALID_GUIDE)
+    return counts.reshape(3, 3)
+
+
+def score_round(yours, mine):
+    """Return my score for a round where the second column is the shape I play."""
+    # A means opponent will play rock, Y paper, Z scissors
+    # X means I should play rock, Y paper, Z scissors
+    score = mine  # shape points
+    offset = (yours - mine) % 3
+    if offset == 0:
+        outcome_points = 3  # draw
+    elif offset == 1:
+        outcome_points = 0  # lose
+    else:
+        outcome_points = 6  # win
+    return score + outcome_points
 
 
 def test02a():
@@ -31,39 +60,61 @@ def test02a():
 
 def day02b(input_path):
     """Return my total score from following the *actual* strategy guide."""
-    with open(input_path) as file_obj:
-        total = 0
-        for line in file_obj:
-            moves = [ord(move) for move in line.strip().split()]
-            yours, outcome = moves
-            yours -= 64  # A --> 1, B --> 2, C --> 3
-            outcome -= 87  # X --> 1, Y --> 2, Z --> 3
-            # A means opponent will play rock, Y paper, Z scissors
-            # X means I should lose, Y means I should draw, Z means I should win
-            if outcome == 1:  # lose
-                outcome_points = 0
-                shape_points = yours - 1
-                if shape_points < 1:
-                    shape_points += 3
-            elif outcome == 2:  # draw
-                outcome_points = 3
-                shape_points = yours
-            else:  # win
-                outcome_points = 6
-                shape_points = yours + 1
-                if shape_points > 3:
-                    shape_points -= 3
-            score = shape_points + outcome_points
-            total += score
-    return total
+    return int(np.sum(count_rounds(input_path) * SCORES_B))
+
+
+def score_round_b(yours, outcome):
+    """Return my score for a round where the second column is the outcome I need."""
+    # A means opponent will play rock, Y paper, Z scissors
+    # X means I should lose, Y means I should draw, Z means I should win
+    if outcome == 1:  # lose
+        outcome_points = 0
+        shape_points = yours - 1
+        if shape_points < 1:
+            shape_points += 3
+    elif outcome == 2:  # draw
+        outcome_points = 3
+        shape_points = yours
+    else:  # win
+        outcome_points = 6
+        shape_points = yours + 1
+        if shape_points > 3:
+            shape_points -= 3
+    return shape_points + outcome_points
+
+
+# scores for every combination of letters (rows A-C, columns X-Z), so a guide can be scored from counts of each
+SCORES_A = np.array([[score_round(yours, mine) for mine in (1, 2, 3)] for yours in (1, 2, 3)])
+SCORES_B = np.array([[score_round_b(yours, outcome) for outcome in (1, 2, 3)] for yours in (1, 2, 3)])
 
 
 def test02b():
     assert 12 == day02b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single pass over the input."""
+    counts = count_rounds(input_path)
+    return int(np.sum(counts * SCORES_A)), int(np.sum(counts * SCORES_B))
+
+
+def test_solve():
+    assert (15, 12) == solve('test_input.txt')
+
+
+def test_invalid_rounds():
+    for lines in (['D O\n'], ['A X\n', 'B\n']):
+        try:
+            solve(lines)
+        except ValueError:
+            continue
+        raise AssertionError(f'{lines} should not be accepted')
+
+
 if __name__ == '__main__':
     test02a()
     print('Day 02a:', day02a('day02_input.txt'))
     test02b()
+    test_solve()
+    test_invalid_rounds()
     print('Day 02b:', day02b('day02_input.txt'))
@@ -0,0 +1,13 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_rounds': 2500 * scale}
+
+
+def generate(file_obj, seed=0, num_rounds=2500):
+    """Write a strategy guide with one 'A X' style round per line."""
+    rng = random.Random(seed)
+    for _ in range(num_rounds):
+        file_obj.write(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n')
@@ -1,25 +1,53 @@
+import os
+import sys
 
+import numpy as np
 
-def parse_input(input_path):
-    with open(input_path) as file_obj:
-        lines = [line.strip() for line in file_obj]
-    return lines
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
 
+# each item type is a single bit, set at the position of its priority (a to z --> 1 to 26, A to Z --> 27 to 52), so a
+# set of items is a uint64 mask and the items two sets have in common are the AND of their masks
+ITEM_MASKS = np.zeros(256, np.uint64)
+ITEM_MASKS[ord('a'):ord('z') + 1] = np.uint64(1) << np.arange(1, 27, dtype=np.uint64)
+ITEM_MASKS[ord('A'):ord('Z') + 1] = np.uint64(1) << np.arange(27, 53, dtype=np.uint64)
 
+
+@profiling.timed('parse')
+def compartment_masks(data):
+    """Return uint64 arrays of the item masks of the first and second compartments of each rucksack in a uint8 array."""
+    starts, ends = parsing.line_bounds(data)
+    middles = starts + (ends - starts) // 2
+    # OR together the items from each line start to its middle, and from each middle to the next line start (the line
+    # ending and any blank lines in between have no items, so they do not change the mask)
+    masks = np.bitwise_or.reduceat(ITEM_MASKS[data], np.stack((starts, middles), axis=1).ravel())
+    return masks[0::2], masks[1::2]
+
+
+def iter_masks(input_path):
+    """Yield (first, second) compartment masks for the rucksacks in each chunk of the input.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    for data in parsing.iter_byte_chunks(input_path):
+        yield compartment_masks(data)
+
+
+def priorities(masks):
+    """Return an int64 array of the priority of the item in each mask, which should hold exactly one item."""
+    lowest = masks & (~masks + np.uint64(1))  # the lowest set bit of each mask
+    if np.any(masks == 0) or np.any(lowest != masks):
+        raise ValueError('Expected exactly one item in common.')
+    # a power of two converts to a float exactly, and frexp returns its exponent plus one
+    return np.frexp(lowest.astype(np.float64))[1].astype(np.int64) - 1
+
+
+@profiling.timed('solve')
 def day03a(input_path):
     """Return the sum of the priorities of the duplicate items in each rucksack."""
-    lines = parse_input(input_path)
     total = 0
-    for line in lines:
-        first, second = line[:len(line)//2], line[len(line)//2:]
-        common_set = set(first) & set(second)
-        assert len(common_set) == 1  # common set should have only one element
-        common = ord(common_set.pop())
-        if common < 97:  # A to Z --> 27 to 52
-            common -= 38
-        else:  # a to z --> 1 to 26
-            common -= 96
-        total += common
+    for first, second in iter_masks(input_path):
+        total += int(priorities(first & second).sum())
     return total
 
 
@@ -27,19 +55,34 @@ def test03a():
     assert 157 == day03a('test_input.txt')
 
 
-def day03b(input_path):
-    """Return the sum of the priorities of the items common to each group of three elves."""
-    lines = parse_input(input_path)
+def badge_priorities(rucksacks, carry, group_size=3):
+    """Return the badge priorities of the complete groups in an array of rucksack masks, and the masks left over.
+
+    `carry` holds the masks left over from the previous chunk, which belong to the first group of this one. The groups
+    are the rows of a 2-D array of masks, so any group size is a single AND-reduce along its rows.
+    """
+    rucksacks = np.concatenate((carry, rucksacks))
+    num_grouped = len(rucksacks) - len(rucksacks) % group_size
+    groups = rucksacks[:num_grouped].reshape(-1, group_size)
+    return priorities(np.bitwise_and.reduce(groups, axis=1)), rucksacks[num_grouped:]
+
+
+def check_last_group(carry, group_size):
+    if len(carry):
+        raise ValueError(f'The last group has {len(carry)} elves instead of {group_size}.')
+
+
+@profiling.timed('solve')
+def day03b(input_path, group_size=3):
+    """Return the sum of the priorities of the items common to each group of `group_size` elves."""
+    if group_size < 1:
+        raise ValueError(f'group_size must be at least 1 but got {group_size}.')
     total = 0
-    for ind in range(0, len(lines), 3):
-        common_set = set(lines[ind]) & set(lines[ind+1]) & set(lines[ind+2])
-        assert len(common_set) == 1  # common set should have only one element
-        common = ord(common_set.pop())
-        if common < 97:  # A to Z --> 27 to 52
-            common -= 38
-        else:  # a to z --> 1 to 26
-            common -= 96
-        total += common
+    carry = np.zeros(0, np.uint64)
+    for first, second in iter_masks(input_path):
+        badges, carry = badge_priorities(first | second, carry, group_size)
+        total += int(badges.sum())
+    check_last_group(carry, group_size)
     return total
 
 
@@ -47,8 +90,35 @@ def test03b():
     assert 70 == day03b('test_input.txt')
 
 
+def test_group_size():
+    lines = ['abcdeZ', 'fghZij', 'Zklmno', 'pqrstu', 'uvwxyz', 'ABCDuE']
+    assert 52 + 21 == day03b(lines, group_size=3)
+    assert 52 == day03b(lines[:3], group_size=3)
+    assert 1 + 2 + 52 + 16 + 21 + 27 == day03b(['aa', 'bb', 'ZZ', 'pp', 'uu', 'AA'], group_size=1)
+
+
+@profiling.timed('solve')
+def solve(input_path, group_size=3):
+    """Return the answers to both parts from a single pass over the input."""
+    total_a = 0
+    total_b = 0
+    carry = np.zeros(0, np.uint64)
+    for first, second in iter_masks(input_path):
+        total_a += int(priorities(first & second).sum())
+        badges, carry = badge_priorities(first | second, carry, group_size)
+        total_b += int(badges.sum())
+    check_last_group(carry, group_size)
+    return total_a, total_b
+
+
+def test_solve():
+    assert (157, 70) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test03a()
     print('Day 03a:', day03a('day03_input.txt'))
     test03b()
+    test_group_size()
+    test_solve()
     print('Day 03b:', day03b('day03_input.txt'))
@@ -0,0 +1,37 @@
+import random
+import string
+
+
+ITEMS = string.ascii_letters
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_groups': 100 * scale}
+
+
+def generate(file_obj, seed=0, num_groups=100, min_half=4, max_half=24):
+    """Write rucksacks in groups of three lines.
+
+    Each rucksack has exactly one item type in both compartments, and each group of three has exactly one item type
+    (the badge) in common. To guarantee that, the badge is only ever put in the first compartment, and the remaining
+    item types are split into a separate pool for each of the three elves in a group.
+    """
+    rng = random.Random(seed)
+    min_half = max(min_half, 2)
+    for _ in range(num_groups):
+        items = list(ITEMS)
+        rng.shuffle(items)
+        badge = items[0]
+        pool_size = (len(items) - 1) // 3
+        for ielf in range(3):
+            pool = items[1 + ielf * pool_size:1 + (ielf + 1) * pool_size]
+            common = pool[0]
+            first_pool = pool[1:pool_size // 2 + 1]
+            second_pool = pool[pool_size // 2 + 1:]
+            half = rng.randint(min_half, max_half)
+            first = [badge, common] + rng.choices(first_pool, k=half - 2)
+            second = [common] + rng.choices(second_pool, k=half - 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            file_obj.write(''.join(first) + ''.join(second) + '\n')
@@ -1,51 +1,262 @@
+import os
+import sys
 
+import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+
+
+@profiling.timed('parse')
 def parse_input(input_path):
-    with open(input_path) as file_obj:
-        lines = [line.strip() for line in file_obj]
-    return lines
+    """Return an Nx4 array of section assignments, where each row is (first min, first max, second min, second max)."""
+    return parsing.read_ints(input_path, signed=False).reshape(-1, 4)
+
+
+def iter_pairs(input_path):
+    """Yield chunks of the Nx4 array of section assignments, reading the input incrementally.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    return parsing.iter_int_chunks(input_path, num_cols=4, signed=False)
+
+
+def count_overlaps(pairs):
+    """Return (contained, overlapping) for an Nx4 array of pairs.
+
+    contained is the number of pairs where one assignment contains the other and overlapping is the number of pairs
+    whose assignments have any section in common.
+    """
+    first_min, first_max, second_min, second_max = pairs.T
+    first_contains = (first_min <= second_min) & (second_max <= first_max)
+    second_contains = (second_min <= first_min) & (first_max <= second_max)
+    contained = first_contains | second_contains
+    overlapping = (first_min <= second_max) & (second_min <= first_max)
+    return int(np.count_nonzero(contained)), int(np.count_nonzero(overlapping))
+
+
+def count_all_overlaps(input_path):
+    """Return (contained, overlapping) counts over every pair in the input, a chunk of pairs at a time."""
+    total_contained = 0
+    total_overlapping = 0
+    for pairs in iter_pairs(input_path):
+        contained, overlapping = count_overlaps(pairs)
+        total_contained += contained
+        total_overlapping += overlapping
+    return total_contained, total_overlapping
+
+
+class SectionIndex:
+    """An index over every elf's assignment for section-coverage queries.
+
+    Elf 2*i is the first elf in pair i and elf 2*i + 1 is the second. Counting the elves that cover a section or
+    overlap a range only needs binary searches in the sorted start and end sections, and listing the elves that cover a
+    section walks down a centered interval tree, so each query takes O(log n) time plus the size of its output.
+    """
+
+    def __init__(self, ranges):
+        ranges = np.asarray(ranges, np.int64).reshape(-1, 2)
+        self.starts = ranges[:, 0]
+        self.ends = ranges[:, 1]
+        self.sorted_starts = np.sort(self.starts)
+        self.sorted_ends = np.sort(self.ends)
+        # each node is (center, starts, ids by start, negated ends, ids by end descending, left child, right child),
+        # holding the ranges that contain its center; ranges entirely below or above it are in the left or right child
+        self.nodes = []
+        self.root = self._build(np.arange(len(ranges)))
+
+    @classmethod
+    @profiling.timed('precompute')
+    def from_input(cls, input_path):
+        """Return an index of the assignments in the input."""
+        return cls(parse_input(input_path))
+
+    def _build(self, ids):
+        if not len(ids):
+            return -1
+        starts = self.starts[ids]
+        ends = self.ends[ids]
+        # the median endpoint leaves at most half of the ranges on either side
+        center = np.median(np.concatenate((starts, ends)))
+        below = ends < center
+        above = starts > center
+        here = ids[~below & ~above]
+        by_start = here[np.argsort(self.starts[here], kind='stable')]
+        by_end = here[np.argsort(-self.ends[here], kind='stable')]
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(ids[below])
+        right = self._build(ids[above])
+        self.nodes[node] = (center, self.starts[by_start], by_start, -self.ends[by_end], by_end, left, right)
+        return node
+
+    def __len__(self):
+        return len(self.starts)
+
+    def count_covering(self, section):
+        """Return the number of elves whose assignment includes a section."""
+        return self.count_overlapping(section, section)
+
+    def count_overlapping(self, first, last):
+        """Return the number of elves whose assignment shares any section with the range first-last."""
+        # a range misses first-last if it starts after last or ends before first, and never both
+        starting_after = len(self) - np.searchsorted(self.sorted_starts, last, 'right')
+        ending_before = np.searchsorted(self.sorted_ends, first, 'left')
+        return int(len(self) - starting_after - ending_before)
+
+    def covering(self, section):
+        """Return a sorted array of the ids of the elves whose assignment includes a section."""
+        found = [np.zeros(0, np.int64)]
+        node = self.root
+        while node >= 0:
+            center, starts, by_start, neg_ends, by_end, left, right = self.nodes[node]
+            if section < center:
+                # every range here ends at or after the center, so it covers the section if it starts by then
+                found.append(by_start[:np.searchsorted(starts, section, 'right')])
+                node = left
+            elif section > center:
+                found.append(by_end[:np.searchsorted(neg_ends, -section, 'right')])
+                node = right
+            else:
+                found.append(by_start)
+                break
+        return np.sort(np.concatenate(found))
 
+    def coverage(self):
+        """Return an int64 array of how many elves cover each section, indexed by section number."""
+        if not len(self):
+            return np.zeros(0, np.int64)
+        size = int(self.ends.max()) + 2
+        # +1 where each range starts and -1 just after it ends, so the running sum is the depth at each section
+        changes = np.bincount(self.starts, minlength=size) - np.bincount(self.ends + 1, minlength=size)
+        return np.cumsum(changes)[:-1]
 
+
+def count_non_increasing_pairs(values):
+    """Return the number of pairs i < j with values[i] >= values[j] in an integer array, in O(n log n) time.
+
+    The values are replaced by their ranks, and the ranks are split one bit at a time from the highest, like an MSD
+    radix sort. At each bit, the values sharing the higher bits form a group (kept in index order), and every 1 before
+    a 0 in a group is a pair with values[i] > values[j] that no other bit counts. Each group is then split stably into
+    its 0s and its 1s with cumulative sums, so every bit is one O(n) pass. Equal values are counted separately.
+    """
+    n = len(values)
+    if n < 2:
+        return 0
+    _, ranks, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = ranks.astype(np.int64).ravel()
+    total = int(np.sum(counts * (counts - 1) // 2))  # pairs of equal values
+    order = np.arange(n)
+    positions = np.arange(n)
+    for bit in range(int(ranks.max()).bit_length() - 1, -1, -1):
+        keys = ranks[order] >> bit
+        ones = keys & 1
+        groups = keys >> 1
+        is_group_start = np.empty(n, bool)
+        is_group_start[0] = True
+        is_group_start[1:] = groups[1:] != groups[:-1]
+        group_starts = np.maximum.accumulate(np.where(is_group_start, positions, 0))
+        # the number of 1s and 0s before each position within its group
+        ones_before = np.cumsum(ones) - ones
+        ones_before -= ones_before[group_starts]
+        zeros_before = positions - group_starts - ones_before
+        total += int(np.sum(ones_before[ones == 0]))
+        # the group's 0s keep their order at its start and its 1s follow them
+        group_ends = np.append(np.flatnonzero(is_group_start)[1:], n)[np.cumsum(is_group_start) - 1]
+        group_zeros = group_ends - group_starts - (ones_before[group_ends - 1] + ones[group_ends - 1])
+        new_positions = group_starts + np.where(ones == 0, zeros_before, group_zeros + ones_before)
+        new_order = np.empty_like(order)
+        new_order[new_positions] = order
+        order = new_order
+    return total
+
+
+def all_pair_overlaps(ranges, return_pairs=False):
+    """Return (overlapping, containing) counts over every pair of elves, not just the pairs in the input.
+
+    overlapping is the number of pairs of elves whose assignments share a section and containing is the number where one
+    assignment contains the other (a subset of the overlapping pairs). With `return_pairs`, also return Mx2 arrays of
+    the elf ids (smaller first, as in SectionIndex) of the overlapping and of the containing pairs.
+
+    Sorting by start (longest first among equal starts) puts every range's overlapping partners that come after it in
+    one contiguous slice, so counting takes O(n log n) time and listing adds the size of the output.
+    """
+    ranges = np.asarray(ranges, np.int64).reshape(-1, 2)
+    order = np.lexsort((-ranges[:, 1], ranges[:, 0]))
+    starts = ranges[order, 0]
+    ends = ranges[order, 1]
+    positions = np.arange(len(ranges))
+    # the ranges after position i that start no later than it ends are exactly the later ranges it overlaps
+    num_later = np.searchsorted(starts, ends, 'right') - positions - 1
+    # and a later range (which starts no earlier) is inside the earlier one if it ends no later
+    overlapping = int(num_later.sum())
+    containing = count_non_increasing_pairs(ends)
+    if not return_pairs:
+        return overlapping, containing
+
+    first = np.repeat(positions, num_later)
+    slice_starts = np.repeat(np.cumsum(num_later) - num_later, num_later)
+    second = first + 1 + np.arange(len(first)) - slice_starts
+    pairs = np.sort(np.stack((order[first], order[second]), axis=1), axis=1)
+    return overlapping, containing, pairs, pairs[ends[second] <= ends[first]]
+
+
+@profiling.timed('solve')
 def day04a(input_path):
     """Return the number of pairs with fully overlapping assignments."""
-    lines = parse_input(input_path)
-    total = 0
-    for line in lines:
-        first, second = line.split(',')
-        first = [int(val) for val in first.split('-')]
-        second = [int(val) for val in second.split('-')]
-        # get the deltas between the mins and maxs of the two sections
-        deltas = [second[ind] - first[ind] for ind in range(2)]
-        if deltas[0] * deltas[1] <= 0:
-            total += 1
-    return total
+    return count_all_overlaps(input_path)[0]
 
 
 def test04a():
     assert 2 == day04a('test_input.txt')
 
 
+@profiling.timed('solve')
 def day04b(input_path):
     """Return the number of pairs with any overlap in assignments."""
-    lines = parse_input(input_path)
-    total = 0
-    for line in lines:
-        first, second = line.split(',')
-        first = [int(val) for val in first.split('-')]
-        second = [int(val) for val in second.split('-')]
-        if (first[0] <= second[1]) and (second[0] <= first[1]):
-            total += 1
-        elif (second[0] <= first[1]) and (first[0] <= second[1]):
-            total += 1
-    return total
+    return count_all_overlaps(input_path)[1]
 
 
 def test04b():
     assert 4 == day04b('test_input.txt')
 
 
+@profiling.timed('solve')
+def solve(input_path):
+    """Return the answers to both parts from a single pass over the input."""
+    return count_all_overlaps(input_path)
+
+
+def test_section_index():
+    index = SectionIndex.from_input('test_input.txt')
+    assert [1, 4, 6, 7, 8, 9, 10, 11] == index.covering(6).tolist()
+    assert [5] == index.covering(9).tolist()
+    assert [] == index.covering(1).tolist()
+    assert 8 == index.count_covering(6)
+    assert 4 == index.count_overlapping(1, 2)
+    assert 0 == index.count_overlapping(10, 12)
+    assert [0, 0, 4, 5, 7, 7, 8, 6, 4, 1] == index.coverage().tolist()
+
+
+def test_all_pair_overlaps():
+    ranges = parse_input('test_input.txt')
+    overlapping, containing, pairs, containing_pairs = all_pair_overlaps(ranges, return_pairs=True)
+    assert (overlapping, containing) == all_pair_overlaps(ranges)
+    assert (overlapping, containing) == (len(pairs), len(containing_pairs))
+    assert (49, 29) == (overlapping, containing)
+    assert [0, 2] in pairs.tolist() and [1, 5] in pairs.tolist() and [0, 1] not in pairs.tolist()
+    assert [6, 7] in containing_pairs.tolist() and [0, 11] not in containing_pairs.tolist()
+
+
+def test_solve():
+    assert (2, 4) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test04a()
     print('Day 04a:', day04a('day04_input.txt'))
     test04b()
+    test_section_index()
+    test_all_pair_overlaps()
+    test_solve()
     print('Day 04b:', day04b('day04_input.txt'))
@@ -0,0 +1,17 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_pairs': 1000 * scale}
+
+
+def generate(file_obj, seed=0, num_pairs=1000, max_section=99):
+    """Write pairs of section assignments, one 'a-b,c-d' pair per line."""
+    rng = random.Random(seed)
+    for _ in range(num_pairs):
+        ranges = []
+        for _ in range(2):
+            low = rng.randint(1, max_section)
+            ranges.append(f'{low}-{rng.randint(low, max_section)}')
+        file_obj.write(','.join(ranges) + '\n')
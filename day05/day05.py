@@ -1,10 +1,21 @@
+import array
+import os
+import pickle
+import sys
 from collections import defaultdict
 
+import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+
+
+@profiling.timed('parse')
 def parse_input(input_path):
-    """Return a dict of lists of crates by column, a list of move instructions, and the max crate column.
+    """Return a dict of lists of crates by column, an Nx3 array of moves, and the max crate column.
 
-    Crates in a column are ordered with the bottom crate first.
+    Crates in a column are ordered with the bottom crate first. Each row of moves is (number of crates, from column, to
+    column).
     """
     max_col_num = 0
     with open(input_path) as file_obj:
@@ -21,30 +32,32 @@ def parse_input(input_path):
                     crates[col_num].append(letter)
             if not found:
                 break
-        moves = [line.strip() for line in file_obj]
+        moves = parsing.extract_ints(file_obj.read(), signed=False).reshape(-1, 3)
         # rearrange crate list to go from bottom to top
         for key in crates:
             crates[key].reverse()
     return crates, moves, max_col_num
 
 
+@profiling.timed('solve')
 def move_crates(crates, moves, model=9000):
-    """Apply move instructions to crates for given CrateMover model."""
-    for move in moves:
-        tokens = move.split()
-        if not tokens:
-            continue
-        num = int(tokens[1])
-        from_col = int(tokens[3])
-        to_col = int(tokens[-1])
-        crates_to_move = crates[from_col][-num:]
-        crates[from_col] = crates[from_col][:-num]
-        # only when using the CrateMover9000, crates are reversed when moved
-        if model == 9000:
+    """Apply an Nx3 array of moves to crates for given CrateMover model.
+
+    Each move only touches the crates it moves: they are copied off the top of the source stack, which is then cut
+    down in place, so a move costs O(crates moved) however tall the stacks are.
+    """
+    if model not in (9000, 9001):
+        raise ValueError(f"Unrecognized model '{model}'.")
+    # only when using the CrateMover9000, crates are reversed when moved
+    reverse = model == 9000
+    for num, from_col, to_col in moves.tolist():
+        source = crates[from_col]
+        start = max(len(source) - num, 0)
+        crates_to_move = source[start:]
+        del source[start:]
+        if reverse:
             crates_to_move.reverse()
-        elif model != 9001:
-            raise ValueError(f"Unrecognized model '{model}'.")
-        crates[to_col] += crates_to_move
+        crates[to_col].extend(crates_to_move)
 
 
 def get_top_crates(crates, max_col_num):
@@ -52,6 +65,189 @@ def get_top_crates(crates, max_col_num):
     return ''.join([crates[num][-1] for num in range(1, max_col_num + 1)])
 
 
+def trace_top_crates(crates, moves, max_col_num, model=9000):
+    """Return the top crates after an Nx3 array of moves without building the intermediate stacks.
+
+    A forward pass only tracks the height of each column, to know how many crates each move really moves. Then each
+    column's final top position is traced backward through the moves to where its crate started. Apart from reading
+    the starting crates, this takes O(moves) time and O(moves + columns) memory however many crates there are.
+    Empty columns are left out of the result.
+    """
+    if model not in (9000, 9001):
+        raise ValueError(f"Unrecognized model '{model}'.")
+    moves = moves.tolist()
+    heights = [len(crates[col_num]) if col_num in crates else 0 for col_num in range(max_col_num + 1)]
+    moved = []
+    for num, from_col, to_col in moves:
+        num = min(num, heights[from_col])
+        moved.append(num)
+        heights[from_col] -= num
+        heights[to_col] += num
+
+    # tracked[col_num] holds [column, index from the bottom] of the crate that ends up on top of col_num, and
+    # by_column finds the tracked crates in a column, since a move can only affect the crates in its to column
+    tracked = {col_num: [col_num, heights[col_num] - 1] for col_num in range(1, max_col_num + 1) if heights[col_num]}
+    by_column = defaultdict(list)
+    for col_num, position in tracked.items():
+        by_column[col_num].append(position)
+    for (_, from_col, to_col), num in zip(reversed(moves), reversed(moved)):
+        # undo the move: the moved crates are the top num of to_col, and they came from the top num of from_col
+        moved_start = heights[to_col] - num
+        heights[to_col] -= num
+        heights[from_col] += num
+        source_start = heights[from_col] - num
+        if not num or not by_column[to_col]:
+            continue
+        staying = []
+        traced = []
+        for position in by_column[to_col]:
+            offset = position[1] - moved_start
+            if offset < 0:
+                staying.append(position)
+                continue
+            position[0] = from_col
+            if model == 9000:
+                position[1] = source_start + num - 1 - offset
+            else:
+                position[1] = source_start + offset
+            traced.append(position)
+        by_column[to_col] = staying
+        by_column[from_col].extend(traced)
+    return ''.join(crates[col][index] for col, index in (tracked[col_num] for col_num in sorted(tracked)))
+
+
+class CrateYard:
+    """The state of the crate stacks together with an append-only log of the moves applied to them.
+
+    The yard can be at any position in the log, so appending moves to a long log only costs the new moves, and the top
+    crates after any move can be read without replaying from the start. A copy of the stacks is kept every
+    `checkpoint_interval` moves (and whenever snapshot() is called), and seek() starts from whichever is nearest: the
+    current state, going forward or undoing moves backward, or the closest copy at or before the target.
+
+    Undoing a move needs to know how many crates it really moved, which can be fewer than it asked for, so that is
+    recorded for each applied move next to the log.
+    """
+
+    def __init__(self, crates, max_col_num, model=9000, checkpoint_interval=1 << 16):
+        if model not in (9000, 9001):
+            raise ValueError(f"Unrecognized model '{model}'.")
+        self.crates = defaultdict(list, {col_num: list(column) for col_num, column in crates.items()})
+        self.max_col_num = max_col_num
+        self.model = model
+        self.moves = array.array('q')  # (number of crates, from column, to column) for each move, flattened
+        self.moved = array.array('q')  # the number of crates each move applied so far actually moved
+        self.position = 0  # the number of moves from the log that have been applied
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {0: self._copy_stacks()}  # move index --> the stacks after that many moves
+
+    @classmethod
+    def from_input(cls, input_path, model=9000, checkpoint_interval=1 << 16):
+        """Return a yard with every move in the input applied."""
+        crates, moves, max_col_num = parse_input(input_path)
+        yard = cls(crates, max_col_num, model=model, checkpoint_interval=checkpoint_interval)
+        yard.append_moves(moves)
+        return yard
+
+    def __len__(self):
+        return len(self.moves) // 3
+
+    def append_moves(self, moves, apply=True):
+        """Add moves (an Nx3 array, or the text of move instructions) to the end of the log and apply them by default.
+
+        If the yard is not at the end of the log, applying also applies any moves between its position and the end.
+        """
+        if isinstance(moves, (str, bytes)):
+            moves = parsing.extract_ints(moves, signed=False)
+        self.moves.frombytes(np.asarray(moves, np.int64).reshape(-1, 3).tobytes())
+        if apply:
+            self.seek(len(self))
+
+    def _copy_stacks(self):
+        # each crate is a single letter, so a stack is stored as a string, which takes a byte per crate
+        return {col_num: ''.join(column) for col_num, column in self.crates.items()}
+
+    def seek(self, index):
+        """Move the yard to the state after the first `index` moves in the log."""
+        if not 0 <= index <= len(self):
+            raise IndexError(f'Move index {index} is outside the log of {len(self)} moves.')
+        checkpoint = max(i for i in self.checkpoints if i <= index)
+        if index - checkpoint < abs(index - self.position):
+            stacks = self.checkpoints[checkpoint]
+            self.crates = defaultdict(list, {col_num: list(column) for col_num, column in stacks.items()})
+            self.position = checkpoint
+        if index < self.position:
+            self._undo(index)
+        else:
+            self._apply(index)
+
+    def _apply(self, index):
+        crates = self.crates
+        moves = self.moves
+        moved = self.moved
+        reverse = self.model == 9000
+        interval = self.checkpoint_interval
+        for i in range(self.position, index):
+            num, from_col, to_col = moves[3 * i:3 * i + 3]
+            source = crates[from_col]
+            start = max(len(source) - num, 0)
+            if i == len(moved):
+                moved.append(len(source) - start)
+            crates_to_move = source[start:]
+            del source[start:]
+            if reverse:
+                crates_to_move.reverse()
+            crates[to_col].extend(crates_to_move)
+            if (i + 1) % interval == 0 and i + 1 not in self.checkpoints:
+                self.checkpoints[i + 1] = self._copy_stacks()
+        self.position = index
+
+    def _undo(self, index):
+        crates = self.crates
+        moves = self.moves
+        reverse = self.model == 9000
+        for i in range(self.position - 1, index - 1, -1):
+            _, from_col, to_col = moves[3 * i:3 * i + 3]
+            num = self.moved[i]
+            target = crates[to_col]
+            start = len(target) - num
+            crates_to_move = target[start:]
+            del target[start:]
+            if reverse:
+                crates_to_move.reverse()
+            crates[from_col].extend(crates_to_move)
+        self.position = index
+
+    def top_crates(self):
+        """Return a string of the top crate from each column at the current position."""
+        return get_top_crates(self.crates, self.max_col_num)
+
+    def top_crates_at(self, index):
+        """Return a string of the top crate from each column after the first `index` moves, seeking there."""
+        self.seek(index)
+        return self.top_crates()
+
+    def snapshot(self):
+        """Keep a copy of the current state and return its position in the log, to pass to restore() later."""
+        if self.position not in self.checkpoints:
+            self.checkpoints[self.position] = self._copy_stacks()
+        return self.position
+
+    def restore(self, snapshot):
+        """Return the yard to the state it was in when `snapshot` was taken, copying the stacks kept by snapshot()."""
+        self.seek(snapshot)
+
+    def save(self, path):
+        """Write the yard, including its move log and position, to a file."""
+        with open(path, 'wb') as file_obj:
+            pickle.dump(self, file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        """Return a yard written by save()."""
+        with open(path, 'rb') as file_obj:
+            return pickle.load(file_obj)
+
+
 def day05a(input_path):
     """Return the top crates from each column at the end of the move instructions."""
     crates, moves, max_col_num = parse_input(input_path)
@@ -74,8 +270,54 @@ def test05b():
     assert 'MCD' == day05b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input."""
+    crates, moves, max_col_num = parse_input(input_path)
+    answers = []
+    for model in (9000, 9001):
+        model_crates = defaultdict(list, {col_num: list(column) for col_num, column in crates.items()})
+        move_crates(model_crates, moves, model=model)
+        answers.append(get_top_crates(model_crates, max_col_num))
+    return tuple(answers)
+
+
+def test_trace_top_crates():
+    crates, moves, max_col_num = parse_input('test_input.txt')
+    assert 'CMZ' == trace_top_crates(crates, moves, max_col_num, model=9000)
+    assert 'MCD' == trace_top_crates(crates, moves, max_col_num, model=9001)
+    assert 'NDP' == trace_top_crates(crates, moves[:0], max_col_num)
+
+
+def test_crate_yard():
+    crates, moves, max_col_num = parse_input('test_input.txt')
+    yard = CrateYard(crates, max_col_num, model=9000)
+    yard.append_moves(moves[:1])
+    assert 'DCP' == yard.top_crates()
+    checkpoint = yard.snapshot()
+    yard.append_moves('move 3 from 1 to 3\nmove 2 from 2 to 1\nmove 1 from 1 to 2\n')
+    assert 'CMZ' == yard.top_crates()
+    assert 'NDP' == yard.top_crates_at(0)
+    yard.restore(checkpoint)
+    assert 'DCP' == yard.top_crates()
+    assert 'CMZ' == yard.top_crates_at(4)
+    # a move can ask for more crates than there are, and the log keeps what it asked for
+    yard = CrateYard({1: ['A', 'B'], 2: ['C']}, 2, checkpoint_interval=1)
+    yard.append_moves('move 5 from 1 to 2\nmove 1 from 2 to 1\n')
+    assert 'AB' == yard.top_crates()
+    assert 'BC' == yard.top_crates_at(0)
+    assert [5, 1, 2, 1, 2, 1] == list(yard.moves)
+    assert 'MCD' == CrateYard.from_input('test_input.txt', model=9001).top_crates()
+
+
+def test_solve():
+    assert ('CMZ', 'MCD') == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test05a()
     print('Day 05a:', day05a('day05_input.txt'))
     test05b()
+    test_trace_top_crates()
+    test_crate_yard()
+    test_solve()
     print('Day 05b:', day05b('day05_input.txt'))
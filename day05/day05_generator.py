@@ -0,0 +1,32 @@
+import random
+import string
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'max_height': 8 * scale, 'num_moves': 500 * scale, 'max_move': 8 * scale}
+
+
+def generate(file_obj, seed=0, num_stacks=9, max_height=8, num_moves=500, max_move=8):
+    """Write a drawing of crate stacks followed by move instructions.
+
+    Moves never take the last crate off a stack, so every stack stays non-empty and has a top crate at the end with
+    either CrateMover model.
+    """
+    rng = random.Random(seed)
+    heights = [rng.randint(1, max_height) for _ in range(num_stacks)]
+
+    # the drawing goes from the top row down to the bottom row
+    for level in range(max(heights), 0, -1):
+        cells = [f'[{rng.choice(string.ascii_uppercase)}]' if h >= level else '   ' for h in heights]
+        file_obj.write(' '.join(cells) + '\n')
+    file_obj.write(' '.join(f'{num:^3}' for num in range(1, num_stacks + 1)) + '\n\n')
+
+    for _ in range(num_moves):
+        sources = [ind for ind, h in enumerate(heights) if h > 1]
+        from_ind = rng.choice(sources)
+        to_ind = rng.choice([ind for ind in range(num_stacks) if ind != from_ind])
+        num = rng.randint(1, min(max_move, heights[from_ind] - 1))
+        heights[from_ind] -= num
+        heights[to_ind] += num
+        file_obj.write(f'move {num} from {from_ind + 1} to {to_ind + 1}\n')
@@ -1,16 +1,150 @@
+import os
+import sys
 
+import numpy as np
 
-def find_marker(input_file, num_unique):
-    """Return the minimum number of characters that must be processed to find the marker."""
-    if input_file.endswith('.txt'):
-        line = open(input_file).read().strip()
-    else:
-        line = input_file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+
+# below this many characters the plain Python scan is faster than setting up the numpy blocks
+SCALAR_SCAN_LIMIT = 1 << 14
+# windows up to this size use _shifted_previous, whose cheap passes for each shift beat sorting for short windows
+SHIFT_SCAN_LIMIT = 64
+
+
+@profiling.timed('solve')
+def find_marker(input_file, num_unique, block_size=1 << 16):
+    """Return the minimum number of characters that must be processed to find the marker, or None if there is none."""
+    data = read_datastream(input_file)
+    if len(data) < SCALAR_SCAN_LIMIT:
+        return scan_marker(data.tobytes(), num_unique)
+    for offset, runs in iter_unique_runs(data, num_unique, block_size=block_size):
+        found = np.flatnonzero(runs >= num_unique)
+        if len(found):
+            return offset + int(found[0]) + 1
+    return None
+
+
+@profiling.timed('solve')
+def find_markers(input_file, window_sizes, find_all=False, block_size=1 << 16):
+    """Return a dict of the marker for each window size, all found in a single pass over the datastream.
+
+    Each size maps to the number of characters processed to find its first marker (or None), or with `find_all`, to an
+    int64 array of every such number, i.e. of the end of every window of that size without a repeat.
+    """
+    sizes = sorted(set(window_sizes))
+    if sizes and sizes[0] < 1:
+        raise ValueError(f'Window sizes must be at least 1 but got {sizes[0]}.')
+    data = read_datastream(input_file)
+    found = {size: [] if find_all else None for size in sizes}
+    remaining = list(sizes)
+    # runs only need to be exact up to the largest size
+    for offset, runs in iter_unique_runs(data, max(sizes, default=1), block_size=block_size):
+        for size in remaining:
+            ends = np.flatnonzero(runs >= size)
+            if find_all:
+                found[size].append(ends + offset + 1)
+            elif len(ends):
+                found[size] = offset + int(ends[0]) + 1
+        if not find_all:
+            remaining = [size for size in remaining if found[size] is None]
+            if not remaining:
+                break
+    if find_all:
+        return {size: np.concatenate(ends) if ends else np.zeros(0, np.int64) for size, ends in found.items()}
+    return found
+
+
+def scan_marker(data, num_unique):
+    """Return the number of characters processed to find the marker in bytes, one character at a time.
+
+    The window always starts just after the last repeat of any character in it, so each character is looked at once.
+    """
+    last_seen = [-1] * 256
+    window_start = 0
+    for ichar, char in enumerate(data):
+        if last_seen[char] >= window_start:
+            window_start = last_seen[char] + 1
+        last_seen[char] = ichar
+        if ichar - window_start + 1 == num_unique:
+            return ichar + 1
+    return None
+
+
+def iter_unique_runs(data, max_run, block_size=1 << 16):
+    """Yield (offset, runs) for each block of a uint8 array, where runs[i] is how many distinct characters end at i.
+
+    That is, runs[i] is the length of the longest window ending at data[offset + i] without a repeat, or at least
+    `max_run` if that window is longer. A window must start after the last copy of each of its characters, so the
+    earliest start is a running maximum over the previous copy of each character. The previous copies are found in one
+    of two ways (see _shifted_previous and _sorted_previous), depending on how far back they need to be looked for.
+    """
+    find_previous = _shifted_previous if max_run <= SHIFT_SCAN_LIMIT else _sorted_previous
+    last_seen = np.full(256, -1, np.int64)  # the position of the last copy of each byte before the block
+    earliest_start = 0  # carried over from the end of the previous block
+    for lo in range(0, len(data), block_size):
+        hi = min(lo + block_size, len(data))
+        starts = find_previous(data, lo, hi, max_run, last_seen)
+        starts += 1
+        starts[0] = max(starts[0], earliest_start)
+        np.maximum.accumulate(starts, out=starts)
+        earliest_start = int(starts[-1])
+        yield lo, np.arange(lo + 1, hi + 1) - starts
+
+
+def _shifted_previous(data, lo, hi, max_run, last_seen):
+    """Return the position of the previous copy of each character in data[lo:hi], looking back only max_run - 1.
 
-    for ichar in range(len(line) - num_unique):
-        chars = line[ichar:ichar + num_unique]
-        if len(set(chars)) == num_unique:
-            return ichar + num_unique
+    Each block is compared with itself shifted by 1 to max_run - 1 characters, which is O(max_run) work per character
+    but in simple passes over memory. Copies further back are reported as max_run characters back, which makes no
+    difference to windows of up to max_run characters. `last_seen` is not needed.
+    """
+    context = max(lo - (max_run - 1), 0)
+    block = data[context:hi]
+    # distance back to the nearest copy of each character, or max_run if there is none that close
+    distance = np.full(len(block), max_run, np.min_scalar_type(max_run))
+    for shift in range(max_run - 1, 0, -1):
+        np.copyto(distance[shift:], shift, where=block[shift:] == block[:-shift])
+    return np.arange(lo, hi) - distance[lo - context:]
+
+
+def _sorted_previous(data, lo, hi, max_run, last_seen):
+    """Return the position of the previous copy of each character in data[lo:hi] (-1 if there is none).
+
+    A stable sort of the bytes (a radix sort for uint8) puts the copies of each character next to each other in order,
+    so this is O(1) work per character however long the windows are. `last_seen` holds the last copy of each byte
+    before the block and is updated for the next one.
+    """
+    block = data[lo:hi]
+    order = np.argsort(block, kind='stable')
+    sorted_bytes = block[order]
+    same_as_previous = sorted_bytes[1:] == sorted_bytes[:-1]
+    # the previous copy is the one just before in sorted order, or the last copy from an earlier block
+    previous = np.empty(len(block), np.int64)
+    previous[order[0]] = last_seen[sorted_bytes[0]]
+    previous[order[1:]] = np.where(same_as_previous, order[:-1] + lo, last_seen[sorted_bytes[1:]])
+    is_last_copy = np.append(~same_as_previous, True)
+    last_seen[sorted_bytes[is_last_copy]] = order[is_last_copy] + lo
+    return previous
+
+
+@profiling.timed('parse')
+def read_datastream(input_file):
+    """Return the datastream as a uint8 array from a .txt file (memory-mapped), or from the argument itself.
+
+    Whitespace at either end of the stream is dropped.
+    """
+    if isinstance(input_file, str) and input_file.endswith('.txt'):
+        data = parsing.read_bytes(input_file, use_mmap=True)
+    else:
+        data = parsing.as_byte_array(input_file)
+    start = 0
+    end = len(data)
+    while start < end and data[start] <= ord(' '):
+        start += 1
+    while end > start and data[end - 1] <= ord(' '):
+        end -= 1
+    return data[start:end]
 
 
 def day06a(input_file):
@@ -29,8 +163,42 @@ def test06b():
     assert 19 == day06b('mjqjpqmgbljsphdztnvjfqwrcgsmlb')
 
 
+def test_find_marker():
+    # the marker can end on the last character, and long streams take the numpy path, also across blocks
+    assert 4 == find_marker('abcd', 4)
+    assert None is find_marker('abca', 4)
+    stream = 'ab' * 50000 + 'cd'
+    assert len(stream) == find_marker(stream, 4, block_size=4096)
+    assert len(stream) - 1 == find_marker(stream, 3, block_size=4096)
+    # windows longer than SHIFT_SCAN_LIMIT take the sorted path
+    stream = bytes(range(100, 199)) * 200 + bytes([199])
+    assert len(stream) == find_marker(stream, 100, block_size=4096)
+    assert 99 == find_marker(stream, 99, block_size=4096)
+
+
+def test_find_markers():
+    assert {4: 7, 14: 19, 27: None} == find_markers('mjqjpqmgbljsphdztnvjfqwrcgsmlb', (14, 4, 27))
+    markers = find_markers('abcdab', (1, 4, 5), find_all=True)
+    assert [1, 2, 3, 4, 5, 6] == markers[1].tolist()
+    assert [4, 5, 6] == markers[4].tolist()
+    assert [] == markers[5].tolist()
+
+
+def solve(input_file):
+    """Return the answers to both parts from a single pass over the input."""
+    markers = find_markers(input_file, (4, 14))
+    return markers[4], markers[14]
+
+
+def test_solve():
+    assert (7, 19) == solve('mjqjpqmgbljsphdztnvjfqwrcgsmlb')
+
+
 if __name__ == '__main__':
     test06a()
     print('Day 06a:', day06a('day06_input.txt'))
     test06b()
+    test_find_marker()
+    test_find_markers()
+    test_solve()
     print('Day 06b:', day06b('day06_input.txt'))
@@ -0,0 +1,29 @@
+import random
+import string
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'length': 4096 * scale, 'marker_at': 1500 * scale}
+
+
+def generate(file_obj, seed=0, length=4096, marker_at=1500, chunk_size=65536):
+    """Write a single-line datastream whose start-of-packet and start-of-message markers come after `marker_at`.
+
+    Before `marker_at`, the stream only uses three letters, so no window of four or more distinct characters can
+    appear there. The 14 characters after it are all distinct, and the rest of the stream is random.
+    """
+    rng = random.Random(seed)
+    marker_at = min(marker_at, length - 14)
+    written = 0
+    while written < marker_at:
+        num = min(chunk_size, marker_at - written)
+        file_obj.write(''.join(rng.choices('abc', k=num)))
+        written += num
+    file_obj.write(''.join(rng.sample(string.ascii_lowercase, 14)))
+    written += 14
+    while written < length:
+        num = min(chunk_size, length - written)
+        file_obj.write(''.join(rng.choices(string.ascii_lowercase, k=num)))
+        written += num
+    file_obj.write('\n')
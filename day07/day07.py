@@ -1,16 +1,37 @@
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import profiling  # noqa: E402
+from common.cache import cached_input  # noqa: E402
 
+
+@profiling.timed('parse')
 def parse_input(input_path):
     with open(input_path) as file_obj:
         lines = [line.strip() for line in file_obj]
     return lines
 
 
-def day07a(input_file):
-    """Return the total sizes of all directories with total size <= 100000."""
+@profiling.timed('precompute')
+@cached_input
+def load_directories(input_file):
+    """Return the root Directory and the set of all Directory objects, with total sizes calculated."""
     lines = parse_input(input_file)
     top_dir, all_dirs = map_directories(lines)
     calc_sizes(top_dir, all_dirs)
+    return top_dir, all_dirs
+
+
+def day07a(input_file):
+    """Return the total sizes of all directories with total size <= 100000."""
+    _, all_dirs = load_directories(input_file)
+    return sum_small_dirs(all_dirs)
+
+
+@profiling.timed('solve')
+def sum_small_dirs(all_dirs):
+    """Return the total sizes of all directories with total size <= 100000."""
     return sum(d.total_size for d in all_dirs if d.total_size <= 100000)
 
 
@@ -19,14 +40,17 @@ def test07a():
 
 
 def day07b(input_file):
+    """Return the size of the smallest directory that can be deleted to free up the needed amount of space."""
+    top_dir, all_dirs = load_directories(input_file)
+    return find_dir_to_delete(top_dir, all_dirs)
+
+
+@profiling.timed('solve')
+def find_dir_to_delete(top_dir, all_dirs):
     """Return the size of the smallest directory that can be deleted to free up the needed amount of space."""
     total_space = 70000000
     required = 30000000
 
-    lines = parse_input(input_file)
-    top_dir, all_dirs = map_directories(lines)
-    calc_sizes(top_dir, all_dirs)
-
     used = top_dir.total_size
     available = total_space - used
     more_needed = required - available
@@ -38,6 +62,16 @@ def test07b():
     assert 24933642 == day07b('test_input.txt')
 
 
+def solve(input_file):
+    """Return the answers to both parts from a single parse of the input."""
+    top_dir, all_dirs = load_directories(input_file)
+    return sum_small_dirs(all_dirs), find_dir_to_delete(top_dir, all_dirs)
+
+
+def test_solve():
+    assert (95437, 24933642) == solve('test_input.txt')
+
+
 class Directory:
 
     def __init__(self, name, parent=None):
@@ -137,4 +171,5 @@ if __name__ == '__main__':
     test07a()
     print('Day 07a:', day07a('day07_input.txt'))
     test07b()
+    test_solve()
     print('Day 07b:', day07b('day07_input.txt'))
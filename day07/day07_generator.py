@@ -0,0 +1,61 @@
+import random
+import string
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_dirs': 200 * scale}
+
+
+def random_names(rng, num, taken=()):
+    """Return `num` distinct random lowercase names that are not in `taken`."""
+    names = set()
+    while len(names) < num:
+        name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 8)))
+        if name not in taken:
+            names.add(name)
+    return sorted(names)
+
+
+def generate(file_obj, seed=0, num_dirs=200, max_subdirs=5, max_files=5, max_file_size=300000):
+    """Write a terminal log of `cd` and `ls` commands that explores a random directory tree depth first.
+
+    Only the stack of directories still to be visited is kept in memory, so very large trees can be written. Every
+    directory gets at least one file, so every directory has a nonzero total size.
+    """
+    rng = random.Random(seed)
+    remaining = num_dirs - 1  # the root directory is already accounted for
+    pending = 0  # number of directories listed but not yet visited
+
+    def visit():
+        nonlocal remaining, pending
+        max_num = min(max_subdirs, remaining)
+        # make sure the tree does not stop growing until all directories have been created
+        num_subdirs = rng.randint(1 if pending == 0 else 0, max_num) if max_num else 0
+        remaining -= num_subdirs
+        pending += num_subdirs
+        subdirs = random_names(rng, num_subdirs)
+        files = random_names(rng, rng.randint(1, max_files), taken=subdirs)
+        entries = [f'dir {name}' for name in subdirs]
+        entries += [f'{rng.randint(1, max_file_size)} {name}{rng.choice(["", ".txt", ".dat", ".log"])}'
+                    for name in files]
+        rng.shuffle(entries)
+        file_obj.write('$ ls\n')
+        file_obj.write('\n'.join(entries) + '\n')
+        return subdirs
+
+    file_obj.write('$ cd /\n')
+    stack = [visit()]
+    levels_up = 0
+    while stack:
+        if stack[-1]:
+            name = stack[-1].pop()
+            pending -= 1
+            # only go back up once we know there is somewhere else to go, so the log ends with an ls listing
+            file_obj.write(levels_up * '$ cd ..\n')
+            levels_up = 0
+            file_obj.write(f'$ cd {name}\n')
+            stack.append(visit())
+        else:
+            stack.pop()
+            levels_up += 1
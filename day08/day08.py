@@ -1,17 +1,32 @@
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import grid, profiling  # noqa: E402
+from common.cache import cached_input  # noqa: E402
+
 
+@profiling.timed('parse')
+@cached_input
 def parse_input(input_path):
-    with open(input_path) as file_obj:
-        lines = [list(line.strip()) for line in file_obj]
-    return np.array(lines).astype(int)
+    """Return a uint8 array of tree heights."""
+    array = grid.read_text(input_path) - ord('0')
+    array.setflags(write=False)  # the array is shared between parts, so make sure nobody modifies it
+    return array
 
 
 def day08a(input_file):
     array = parse_input(input_file)
+    return count_visible(array)
+
 
+@profiling.timed('solve')
+def count_visible(array):
+    """Return the number of trees visible from outside the grid."""
     # start by assuming no trees are visible
-    visible = np.zeros_like(array)
+    visible = np.zeros(array.shape, bool)
 
     # but we know that all trees on the border are visible
     visible[0, :] = 1
@@ -29,16 +44,10 @@ def day08a(input_file):
 
 
 def check_visibility_top_to_bottom(array):
-    """For each column of trees (skipping borders), check each tree's visibility from the top of the row going down."""
-    visible = np.zeros_like(array)
-    for icol in range(1, array.shape[1]):
-        max_val = array[0, icol]
-        for irow in range(1, array.shape[0]):
-            val = array[irow, icol]
-            if val > max_val:
-                max_val = val
-                visible[irow, icol] = 1
-    return visible
+    """For each column of trees, return a boolean array of whether each tree is visible from the top of the column."""
+    # a tree is visible if it is taller than the tallest tree above it, and nothing is above the top row
+    tallest_above = grid.shift(np.maximum.accumulate(array, axis=0), (1, 0), fill=np.iinfo(array.dtype).max)
+    return array > tallest_above
 
 
 def test08a():
@@ -48,6 +57,12 @@ def test08a():
 def day08b(input_file):
     """Return the maximum possible scenic score for any tree in the given grid of tree heights."""
     array = parse_input(input_file)
+    return max_scenic_score(array)
+
+
+@profiling.timed('solve')
+def max_scenic_score(array):
+    """Return the maximum scenic score for any tree in a grid of tree heights."""
     n_row, n_col = array.shape
 
     max_score = 0
@@ -100,8 +115,19 @@ def test08b():
     assert 8 == day08b('test_input.txt')
 
 
+def solve(input_file):
+    """Return the answers to both parts from a single parse of the input."""
+    array = parse_input(input_file)
+    return count_visible(array), max_scenic_score(array)
+
+
+def test_solve():
+    assert (21, 8) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test08a()
     print('Day 08a:', day08a('day08_input.txt'))
     test08b()
+    test_solve()
     print('Day 08b:', day08b('day08_input.txt'))
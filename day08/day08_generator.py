@@ -0,0 +1,15 @@
+import math
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    side = round(99 * math.sqrt(scale))
+    return {'num_rows': side, 'num_cols': side}
+
+
+def generate(file_obj, seed=0, num_rows=99, num_cols=99):
+    """Write a grid of single-digit tree heights, one row per line."""
+    rng = random.Random(seed)
+    for _ in range(num_rows):
+        file_obj.write(''.join(rng.choices('0123456789', k=num_cols)) + '\n')
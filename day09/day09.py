@@ -1,5 +1,11 @@
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+
 
 DIRECTION_TO_DELTA = {
     'R': np.array([0, 1]),
@@ -10,15 +16,24 @@ DIRECTION_TO_DELTA = {
 
 
 def parse_input(input_path):
-    moves = []
-    with open(input_path) as file_obj:
-        for line in file_obj:
-            tokens = line.strip().split()
-            moves.append([tokens[0], int(tokens[1])])
-    return moves
+    """Return a list of moves, where each move is a list [direction, num_steps]."""
+    return list(iter_moves(input_path))
+
+
+def iter_moves(input_path):
+    """Yield moves [direction, num_steps], reading the input incrementally.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    for chunk in parsing.iter_line_chunks(input_path):
+        data = parsing.as_byte_array(chunk)
+        directions = data[parsing.line_starts(data)].tobytes().decode()
+        num_steps = parsing.extract_ints(data, signed=False).tolist()
+        yield from ([direction, num] for direction, num in zip(directions, num_steps))
 
 
-def calc_visits(moves, num_tails=1, size=500):
+@profiling.timed('solve')
+def calc_visits(moves, num_tails=1, size=500, tracked_tails=None):
     """For a given set of moves, calculate the number of unique positions that the rope tail visits.
 
     Args:
@@ -27,11 +42,15 @@ def calc_visits(moves, num_tails=1, size=500):
         num_tails: optional int; number of tails in rope; defaults to 1
         size: optional int; size of grid of all possible positions; yes, I could have tried to intelligently calculate
             an appropriate size, but this worked
+        tracked_tails: optional sequence of tail indices (0 is the tail closest to the head); if given, count visits
+            for each of these tails instead of only the last one
 
     Returns:
-        int, total number of unique positions visited by the last tail
+        int, total number of unique positions visited by the last tail, or a list of ints with the number of unique
+        positions visited by each tracked tail if tracked_tails is given
     """
-    grid = np.zeros([size, size], int)
+    track = [num_tails - 1] if tracked_tails is None else list(tracked_tails)
+    grids = np.zeros([len(track), size, size], int)
     head = size // 2 * np.ones(2, int)
     tails = size // 2 * np.ones([num_tails, 2], int)
     for direction, num in moves:
@@ -45,12 +64,14 @@ def calc_visits(moves, num_tails=1, size=500):
                     tail_delta = np.minimum(np.abs(gap), np.array([1, 1])) * np.sign(gap)
                     tails[itail] += tail_delta
                 prev = tails[itail]
-            grid[tuple(tails[-1])] = 1
-    return np.sum(np.sum(grid))
+            for igrid, itail in enumerate(track):
+                grids[(igrid,) + tuple(tails[itail])] = 1
+    visits = [np.sum(np.sum(grid)) for grid in grids]
+    return visits[0] if tracked_tails is None else visits
 
 
 def day09a(input_file):
-    moves = parse_input(input_file)
+    moves = iter_moves(input_file)
     return calc_visits(moves)
 
 
@@ -59,7 +80,7 @@ def test09a():
 
 
 def day09b(input_file):
-    moves = parse_input(input_file)
+    moves = iter_moves(input_file)
     return calc_visits(moves, num_tails=9)
 
 
@@ -67,8 +88,23 @@ def test09b():
     assert 1 == day09b('test_input.txt')
 
 
+def solve(input_file):
+    """Return the answers to both parts from a single simulation, tracking the first and last tails of the long rope.
+
+    Each knot only follows the one in front of it, so the first tail of a 9-tail rope moves exactly like the only tail
+    of a 1-tail rope.
+    """
+    moves = iter_moves(input_file)
+    return tuple(calc_visits(moves, num_tails=9, tracked_tails=[0, 8]))
+
+
+def test_solve():
+    assert (13, 1) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test09a()
     print('Day 09a:', day09a('day09_input.txt'))
     test09b()
+    test_solve()
     print('Day 09b:', day09b('day09_input.txt'))
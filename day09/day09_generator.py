@@ -0,0 +1,32 @@
+import random
+
+
+DIRECTION_TO_DELTA = {'R': (0, 1), 'L': (0, -1), 'U': (-1, 0), 'D': (1, 0)}
+OPPOSITE = {'R': 'L', 'L': 'R', 'U': 'D', 'D': 'U'}
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_moves': 2000 * scale}
+
+
+def generate(file_obj, seed=0, num_moves=2000, max_steps=20, max_extent=200):
+    """Write rope head moves, one 'R 4' style move per line.
+
+    The head is kept within `max_extent` of its starting position in each direction, so the rope stays inside the
+    fixed-size grid used by `calc_visits`.
+    """
+    rng = random.Random(seed)
+    row = col = 0
+    for _ in range(num_moves):
+        direction = rng.choice('RLUD')
+        d_row, d_col = DIRECTION_TO_DELTA[direction]
+        room = max_extent - (row * d_row + col * d_col)  # distance to the edge in this direction
+        if room < 1:
+            direction = OPPOSITE[direction]
+            d_row, d_col = -d_row, -d_col
+            room = max_extent - (row * d_row + col * d_col)
+        steps = rng.randint(1, min(max_steps, room))
+        row += steps * d_row
+        col += steps * d_col
+        file_obj.write(f'{direction} {steps}\n')
@@ -1,21 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
 
 
 def parse_input(input_path):
-    instructions = []
-    with open(input_path) as file_obj:
-        for line in file_obj:
-            tokens = line.strip().split()
-            instructions.append(tokens)
-    return instructions
+    """Yield the tokens of each instruction, reading the input incrementally.
+
+    input_path can be a file path, '-' for stdin, a file object, or any iterable of lines.
+    """
+    with parsing.open_lines(input_path) as lines:
+        for line in lines:
+            tokens = line.split()
+            if tokens:
+                yield tokens
 
 
 class ClockCircuitAnalyzer:
     """ClockCircuitAnalyzer iterates through instructions and keeps track of the current and next states."""
 
     def __init__(self, input_path):
-        instructions = parse_input(input_path)
-        instructions.reverse()  # reverse instructions so that we can pop them off later
-        self.instructions = instructions
+        self.instructions = parse_input(input_path)  # instructions are read one at a time as they are needed
         self.prev_cycle = 0
         self.next_cycle = 0
         self.x = 1  # x starts at 1
@@ -27,9 +33,8 @@ class ClockCircuitAnalyzer:
         self.prev_cycle = self.next_cycle
 
         # try to get the next instruction
-        try:
-            instruction = self.instructions.pop()
-        except IndexError:
+        instruction = next(self.instructions, None)
+        if instruction is None:
             # if we're out of instructions, just increment the cycle and exit
             self.next_cycle += 1
             return
@@ -44,6 +49,7 @@ class ClockCircuitAnalyzer:
             raise RuntimeError(f"Invalid instruction '{instruction[0]}'")
 
 
+@profiling.timed('solve')
 def day10a(input_path):
     """Return the sum of the signal strengths at cycle 20 and every 40 later cycles through cycle 220."""
     stops = list(range(20, 221, 40))
@@ -68,16 +74,27 @@ def test10a():
 
 def day10b(input_path):
     """Print out the screen after 240 cycles."""
+    _, screen = run_crt(input_path)
+    return screen
+
+
+@profiling.timed('solve')
+def run_crt(input_path):
+    """Return the sum of the signal strengths (as in part 1) and the screen after 240 cycles, in one pass."""
+    signal_cycles = set(range(20, 221, 40))
     stops = list(range(1, 242))  # I kind of want to do a generator instead
     stops.reverse()
     this_cycle = stops.pop()
 
+    signal_total = 0
     screen = ''
     row = ''
     row_length = 40
     c = ClockCircuitAnalyzer(input_path)
     while c.prev_cycle < 242:
         while stops and (c.prev_cycle < this_cycle <= c.next_cycle):
+            if this_cycle in signal_cycles:
+                signal_total += this_cycle * c.x
             # x gives the center of the sprite position, and the sprite is 3 pixels wide
             sprite_min = c.x - 1
             sprite_max = c.x + 1
@@ -93,7 +110,7 @@ def day10b(input_path):
             this_cycle = stops.pop()
         c.advance()
 
-    return screen
+    return signal_total, screen
 
 
 def test10b():
@@ -109,9 +126,21 @@ def test10b():
     assert expected == day10b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single pass through the instructions."""
+    return run_crt(input_path)
+
+
+def test_solve():
+    signal_total, screen = solve('test_input.txt')
+    assert 13140 == signal_total
+    assert screen == day10b('test_input.txt')
+
+
 if __name__ == '__main__':
     test10a()
     print('Day 10a:', day10a('day10_input.txt'))
     test10b()
+    test_solve()
     print('Day 10b:')
     print(day10b('day10_input.txt'))
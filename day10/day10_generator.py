@@ -0,0 +1,16 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_instructions': 145 * scale}
+
+
+def generate(file_obj, seed=0, num_instructions=145, addx_fraction=0.7, max_value=20):
+    """Write a program of 'noop' and 'addx V' instructions, one per line."""
+    rng = random.Random(seed)
+    for _ in range(num_instructions):
+        if rng.random() < addx_fraction:
+            file_obj.write(f'addx {rng.randint(-max_value, max_value) or 1}\n')
+        else:
+            file_obj.write('noop\n')
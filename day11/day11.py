@@ -1,14 +1,16 @@
+import copy
 import operator
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import profiling  # noqa: E402
 
 
 def day11a(input_path):
     """Return the level of monkey business after 20 rounds of monkeys throwing items around."""
     monkey_list = parse_input(input_path)
-    for _ in range(20):
-        for monkey in monkey_list:
-            take_turn(monkey, monkey_list)
-    counts = sorted([monkey.count for monkey in monkey_list])
-    return counts[-1] * counts[-2]
+    return monkey_business(monkey_list, num_rounds=20)
 
 
 def test11a():
@@ -22,13 +24,20 @@ def day11b(input_path):
     """
     monkey_list = parse_input(input_path)
     convert_ints(monkey_list)
-    for _ in range(10000):
+    return monkey_business(monkey_list, num_rounds=10000, worry_reduction=False)
+
+
+@profiling.timed('solve')
+def monkey_business(monkey_list, num_rounds, worry_reduction=True):
+    """Run the given number of rounds and return the product of the two highest inspection counts."""
+    for _ in range(num_rounds):
         for monkey in monkey_list:
-            take_turn(monkey, monkey_list, worry_reduction=False)
+            take_turn(monkey, monkey_list, worry_reduction=worry_reduction)
     counts = sorted([monkey.count for monkey in monkey_list])
     return counts[-1] * counts[-2]
 
 
+@profiling.timed('precompute')
 def convert_ints(monkey_list):
     """Convert worry level integer values to a different format for the purposes of solving this problem."""
     divisors = sorted([m.test['multiple'] for m in monkey_list])
@@ -40,6 +49,20 @@ def test11b():
     assert 2713310158 == day11b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input."""
+    monkey_list = parse_input(input_path)
+    monkey_list_b = copy.deepcopy(monkey_list)
+    answer_a = monkey_business(monkey_list, num_rounds=20)
+    convert_ints(monkey_list_b)
+    return answer_a, monkey_business(monkey_list_b, num_rounds=10000, worry_reduction=False)
+
+
+def test_solve():
+    assert (10605, 2713310158) == solve('test_input.txt')
+
+
+@profiling.timed('parse')
 def parse_input(input_path):
     """Parse the input file and return a list of monkeys in order of monkey index, starting from 0."""
     with open(input_path) as file_obj:
@@ -186,4 +209,5 @@ if __name__ == '__main__':
     test11a()
     print('Day 11a:', day11a('day11_input.txt'))
     test11b()
+    test_solve()
     print('Day 11b:', day11b('day11_input.txt'))
@@ -0,0 +1,48 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'max_items': 8 * scale}
+
+
+def primes(num):
+    """Return the first `num` prime numbers."""
+    found = []
+    candidate = 2
+    while len(found) < num:
+        if all(candidate % p for p in found):
+            found.append(candidate)
+        candidate += 1
+    return found
+
+
+def generate(file_obj, seed=0, num_monkeys=8, max_items=8, min_worry=50, max_worry=99):
+    """Write monkey descriptions separated by blank lines.
+
+    Each monkey tests divisibility by a different prime, and never throws items to itself.
+    """
+    rng = random.Random(seed)
+    divisors = primes(num_monkeys)
+    rng.shuffle(divisors)
+    squaring_monkey = rng.randrange(num_monkeys)
+    for monkey_id in range(num_monkeys):
+        if monkey_id:
+            file_obj.write('\n')
+        items = [str(rng.randint(min_worry, max_worry)) for _ in range(rng.randint(1, max_items))]
+        if monkey_id == squaring_monkey:
+            operation = 'old * old'
+        elif rng.random() < 0.3:
+            operation = f'old * {rng.randint(2, 19)}'
+        else:
+            operation = f'old + {rng.randint(1, 8)}'
+        others = [ind for ind in range(num_monkeys) if ind != monkey_id]
+        true_monkey, false_monkey = rng.sample(others, 2) if len(others) > 1 else (others[0], others[0])
+        file_obj.write(
+            f'Monkey {monkey_id}:\n'
+            f'  Starting items: {", ".join(items)}\n'
+            f'  Operation: new = {operation}\n'
+            f'  Test: divisible by {divisors[monkey_id]}\n'
+            f'    If true: throw to monkey {true_monkey}\n'
+            f'    If false: throw to monkey {false_monkey}\n'
+        )
@@ -0,0 +1,33 @@
+import math
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    factor = math.sqrt(scale)
+    return {'num_rows': round(41 * factor), 'num_cols': round(80 * factor)}
+
+
+def generate(file_obj, seed=0, num_rows=41, num_cols=80, dip_fraction=0.2):
+    """Write a height map that slopes up from 'a' on the left to 'z' on the right, with random dips.
+
+    The row containing the start square has no dips, and the last column is all 'z', so the end square can always be
+    reached from the start square by climbing at most one unit per step.
+    """
+    if num_cols < 26:
+        raise ValueError(f'Need at least 26 columns to climb from a to z, but got {num_cols}.')
+    rng = random.Random(seed)
+    start_row = rng.randrange(num_rows)
+    end_row = rng.randrange(num_rows)
+    ramp = [chr(ord('a') + col * 25 // (num_cols - 1)) for col in range(num_cols)]
+    for row in range(num_rows):
+        line = list(ramp)
+        if row != start_row:
+            for col in range(num_cols - 1):
+                if rng.random() < dip_fraction:
+                    line[col] = chr(rng.randint(ord('a'), ord(line[col])))
+        if row == start_row:
+            line[0] = 'S'
+        if row == end_row:
+            line[-1] = 'E'
+        file_obj.write(''.join(line) + '\n')
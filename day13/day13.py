@@ -1,5 +1,11 @@
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import profiling  # noqa: E402
 
+
+@profiling.timed('parse')
 def parse_input(input_path):
     """Return a list of pairs of packets."""
     pairs = []
@@ -11,12 +17,21 @@ def parse_input(input_path):
             else:
                 pairs.append(pair)
                 pair = []
+    # the last pair is not followed by a blank line if the file does not end with one
+    if pair:
+        pairs.append(pair)
     return pairs
 
 
 def day13a(input_path):
     """Return the sum of indices of pairs that are in the correct order."""
     pairs = parse_input(input_path)
+    return sum_ordered_indices(pairs)
+
+
+@profiling.timed('solve')
+def sum_ordered_indices(pairs):
+    """Return the sum of indices of pairs that are in the correct order."""
     index_sum = 0
     for ind, pair in enumerate(pairs):
         if Packet(pair[0]) < Packet(pair[1]):
@@ -78,6 +93,7 @@ def test13a():
     assert 13 == day13a('test_input.txt')
 
 
+@profiling.timed('parse')
 def parse_input_b(input_path):
     """Return a list of all packets (not paired)."""
     packets = []
@@ -91,10 +107,15 @@ def parse_input_b(input_path):
 def day13b(input_path):
     """Return the product of the indices of the first and second divider packets after sorting."""
     packets = parse_input_b(input_path)
+    return find_decoder_key(packets)
+
+
+@profiling.timed('solve')
+def find_decoder_key(packets):
+    """Return the product of the indices of the first and second divider packets after sorting with the packets."""
     first = [[2]]
     second = [[6]]
-    packets += [first, second]
-    packets = [Packet(p) for p in packets]
+    packets = [Packet(p) for p in packets + [first, second]]
     packets = sorted(packets)
 
     first_ind = 0
@@ -113,8 +134,20 @@ def test13b():
     assert 140 == day13b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input."""
+    packets = parse_input_b(input_path)
+    pairs = list(zip(packets[::2], packets[1::2]))
+    return sum_ordered_indices(pairs), find_decoder_key(packets)
+
+
+def test_solve():
+    assert (13, 140) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test13a()
     print('Day 13a:', day13a('day13_input.txt'))
     test13b()
+    test_solve()
     print('Day 13b:', day13b('day13_input.txt'))
@@ -0,0 +1,25 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_pairs': 150 * scale}
+
+
+def random_packet(rng, max_depth, max_length, max_value=10):
+    """Return a random packet (a list of integers and nested lists) as a string."""
+    items = []
+    for _ in range(rng.randint(0, max_length)):
+        if max_depth and rng.random() < 0.3:
+            items.append(random_packet(rng, max_depth - 1, max_length, max_value))
+        else:
+            items.append(str(rng.randint(0, max_value)))
+    return '[' + ','.join(items) + ']'
+
+
+def generate(file_obj, seed=0, num_pairs=150, max_depth=4, max_length=5):
+    """Write pairs of packets, with a blank line after each pair."""
+    rng = random.Random(seed)
+    for _ in range(num_pairs):
+        file_obj.write(random_packet(rng, max_depth, max_length) + '\n')
+        file_obj.write(random_packet(rng, max_depth, max_length) + '\n\n')
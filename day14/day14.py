@@ -1,24 +1,29 @@
+import copy
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import grid, parsing, profiling  # noqa: E402
+
+
+EMPTY, ROCK, SAND = 0, 1, 2  # cell codes in Cave.array
+
 
+@profiling.timed('parse')
 def parse_input(input_path):
     """Return a list of Nx2 numpy arrays, where array columns are x and y coordinates for rock formations.
 
     Each array defines a set of lines that makes up a single rock formation.
     """
-    segments = []
-    with open(input_path) as file_obj:
-        for line in file_obj:
-            points = []
-            for xy in line.strip().split('->'):
-                points.append([int(val) for val in xy.split(',')])
-            segments.append(np.array(points))
-    return segments
+    return [values.reshape(-1, 2) for values in parsing.read_int_lines(input_path, signed=False)]
 
 
 class Cave:
     """Capture layout of cave, including rock formations and sand."""
 
+    @profiling.timed('precompute')
     def __init__(self, segments):
         self.sand_escaped = False  # becomes True when sand starts falling into the abyss
         self.sand_blocked = False  # becomes True when the entry point for sand is blocked
@@ -26,9 +31,10 @@ class Cave:
         maxs = np.max(np.stack([np.max(seg, axis=0) for seg in segments]), axis=0)
         height = maxs[1] + 3
         width = maxs[0] - mins[0] + 2 * height
-        self.array = np.array(height * [width * ['.']])  # grid of empty (.), rock (#), and sand (o) positions
-        self.x_offset = mins[0] - height  # x-coordinate adjustment
-        self.entry_xy = np.array([500 - self.x_offset, 0])
+        # grid of EMPTY, ROCK and SAND codes; sand falls down columns, so store it column by column (Fortran order)
+        self.array = np.zeros((height, width), np.uint8, order='F')
+        self.x_offset = int(mins[0] - height)  # x-coordinate adjustment
+        self.entry_xy = (500 - self.x_offset, 0)
 
         # set up rock formations
         for seg in segments:
@@ -36,45 +42,51 @@ class Cave:
             for ind in range(len(seg) - 1):
                 min_xy = np.min(seg[ind:ind + 2], axis=0)
                 max_xy = np.max(seg[ind:ind + 2], axis=0)
-                self.array[min_xy[1]:max_xy[1] + 1, min_xy[0]:max_xy[0] + 1] = '#'
+                self.array[min_xy[1]:max_xy[1] + 1, min_xy[0]:max_xy[0] + 1] = ROCK
 
     def add_floor(self):
         """Add in rock representing the cave floor (part 2 only)."""
-        self.array[-1, :] = '#'
+        self.array[-1, :] = ROCK
 
     def __str__(self):
-        return '\n'.join((''.join(row) for row in self.array))
+        return grid.to_text(self.array, '.#o')
 
     def drop_sand(self, start_x, start_y):
         """Simulate a grain of sand falling until either it comes to rest or we determine it will not."""
-        done = False
-        while not done:
-            next_y = np.argmax(self.array[start_y:, start_x] != '.') - 1 + start_y
-            if (next_y < start_y) or (start_x == 0) or (start_x == self.array.shape[1] - 1):
+        array = self.array
+        last_x = array.shape[1] - 1
+        while True:
+            next_y = int((array[start_y:, start_x] != EMPTY).argmax()) - 1 + start_y
+            if (next_y < start_y) or (start_x == 0) or (start_x == last_x):
                 self.sand_escaped = True  # sand is going to fall into the abyss
                 return
-            if self.array[next_y + 1, start_x - 1] == '.':
+            if array[next_y + 1, start_x - 1] == EMPTY:
                 start_x -= 1
                 start_y = next_y + 1
-            elif self.array[next_y + 1, start_x + 1] == '.':
+            elif array[next_y + 1, start_x + 1] == EMPTY:
                 start_x += 1
                 start_y = next_y + 1
             else:
-                self.array[next_y, start_x] = 'o'
-                if (start_x == self.entry_xy[0]) and (next_y == self.entry_xy[1]):
+                array[next_y, start_x] = SAND
+                if (start_x, next_y) == self.entry_xy:
                     self.sand_blocked = True
-                done = True
+                return
 
 
 def day14a(input_path):
     """Return the number of grains of sand that come to rest on the rock formations."""
     segments = parse_input(input_path)
     cave = Cave(segments)
+    return count_resting_sand(cave)
+
 
-    sand_xy = np.array([500 - cave.x_offset, 0])
+@profiling.timed('solve')
+def count_resting_sand(cave):
+    """Drop sand into the cave until it starts falling into the abyss and return the number of grains at rest."""
+    start_x, start_y = cave.entry_xy
     num_sand = 0
     while True:
-        cave.drop_sand(start_x=sand_xy[0], start_y=sand_xy[1])
+        cave.drop_sand(start_x=start_x, start_y=start_y)
         if cave.sand_escaped:
             break
         num_sand += 1
@@ -89,12 +101,17 @@ def day14b(input_path):
     """Return the number of grains of sand that are able to fall into the cave."""
     segments = parse_input(input_path)
     cave = Cave(segments)
-    cave.add_floor()
+    return count_sand_until_blocked(cave)
 
-    sand_xy = np.array([500 - cave.x_offset, 0])
+
+@profiling.timed('solve')
+def count_sand_until_blocked(cave):
+    """Add the floor to the cave, then drop sand until the entry point is blocked and return the number of grains."""
+    cave.add_floor()
+    start_x, start_y = cave.entry_xy
     num_sand = 0
     while not cave.sand_blocked:
-        cave.drop_sand(start_x=sand_xy[0], start_y=sand_xy[1])
+        cave.drop_sand(start_x=start_x, start_y=start_y)
         num_sand += 1
     return num_sand
 
@@ -103,8 +120,20 @@ def test14b():
     assert 93 == day14b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input and a single cave layout."""
+    cave = Cave(parse_input(input_path))
+    cave_b = copy.deepcopy(cave)
+    return count_resting_sand(cave), count_sand_until_blocked(cave_b)
+
+
+def test_solve():
+    assert (24, 93) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test14a()
     print('Day 14a:', day14a('day14_input.txt'))
     test14b()
+    test_solve()
     print('Day 14b:', day14b('day14_input.txt'))
@@ -0,0 +1,26 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_paths': 150 * scale}
+
+
+def generate(file_obj, seed=0, num_paths=150, min_x=440, max_x=560, min_y=13, max_y=170, max_points=6,
+             max_length=10):
+    """Write rock paths, one 'x,y -> x,y -> ...' path per line, made of horizontal and vertical segments."""
+    rng = random.Random(seed)
+    for _ in range(num_paths):
+        x = rng.randint(min_x, max_x)
+        y = rng.randint(min_y, max_y)
+        points = [f'{x},{y}']
+        horizontal = rng.random() < 0.5
+        for _ in range(rng.randint(1, max_points - 1)):
+            step = rng.randint(1, max_length) * rng.choice((-1, 1))
+            if horizontal:
+                x = min(max(x + step, min_x), max_x)
+            else:
+                y = min(max(y + step, min_y), max_y)
+            points.append(f'{x},{y}')
+            horizontal = not horizontal
+        file_obj.write(' -> '.join(points) + '\n')
@@ -1,29 +1,32 @@
+import os
+import sys
+
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import parsing, profiling  # noqa: E402
+from common.cache import cached_input  # noqa: E402
+
 
+@profiling.timed('parse')
+@cached_input
 def parse_input(input_path):
-    data = []
-    with open(input_path) as file_obj:
-        for line in file_obj:
-            if not line.strip():
-                break
-            assert line.startswith('Sensor at')
-            sensor, beacon = line.strip().split(':')
-            xy = sensor[len('Sensor at'):].strip().split(', ')
-            sensor = [int(token[2:]) for token in xy]
-            xy = beacon[len(' closest beacon is at'):].strip().split(', ')
-            beacon = [int(token[2:]) for token in xy]
-            data.append({
-                'sensor': np.array(sensor),
-                'beacon': np.array(beacon),
-                'dist': np.abs(np.array(sensor) - np.array(beacon)).sum(),
-            })
-    return data
+    """Return a list of dicts with the sensor position, closest beacon position, and distance between them."""
+    values = parsing.read_ints(input_path).reshape(-1, 4)
+    sensors, beacons = values[:, :2], values[:, 2:]
+    dists = np.abs(sensors - beacons).sum(axis=1)
+    return [{'sensor': s, 'beacon': b, 'dist': d} for s, b, d in zip(sensors, beacons, dists)]
 
 
 def day15a(input_path, row=2000000):
     """Return the number of positions in the specified row that cannot contain a beacon."""
     data = parse_input(input_path)
+    return count_eliminated(data, row)
+
+
+@profiling.timed('solve')
+def count_eliminated(data, row):
+    """Return the number of positions in the specified row that cannot contain a beacon, given parsed sensor data."""
     eliminated_cols = set()
     beacon_cols = set()
     for item in data:
@@ -53,6 +56,12 @@ def day15b(input_path, max_coord=4000000):
     pairs of sensors and their closest beacon.
     """
     data = parse_input(input_path)
+    return find_tuning_frequency(data, max_coord)
+
+
+@profiling.timed('solve')
+def find_tuning_frequency(data, max_coord):
+    """Return the tuning frequency for the distress beacon, given parsed sensor data."""
     min_col = 0
     max_col = max_coord
     for row_ind in range(max_coord + 1):
@@ -79,8 +88,19 @@ def test15b():
     assert 56000011 == day15b('test_input.txt', max_coord=20)
 
 
+def solve(input_path, row=2000000, max_coord=4000000):
+    """Return the answers to both parts from a single parse of the input."""
+    data = parse_input(input_path)
+    return count_eliminated(data, row), find_tuning_frequency(data, max_coord)
+
+
+def test_solve():
+    assert (26, 56000011) == solve('test_input.txt', row=10, max_coord=20)
+
+
 if __name__ == '__main__':
     test15a()
     print('Day 15a:', day15a('day15_input.txt'))
     test15b()
+    test_solve()
     print('Day 15b:', day15b('day15_input.txt'))
@@ -0,0 +1,35 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_sensors': 30 * scale}
+
+
+def generate(file_obj, seed=0, num_sensors=30, max_coord=4000000):
+    """Write sensor and closest beacon positions, one sensor per line.
+
+    A hidden point inside the search area is picked first, and every sensor's closest beacon is placed closer to the
+    sensor than that point is, so the hidden point is never ruled out. Nothing guarantees that it is the only such
+    point, though. Sensors and beacons are all inside the search area.
+    """
+    rng = random.Random(seed)
+    hidden_x = rng.randint(0, max_coord)
+    hidden_y = rng.randint(0, max_coord)
+    for _ in range(num_sensors):
+        while True:
+            sensor_x = rng.randint(0, max_coord)
+            sensor_y = rng.randint(0, max_coord)
+            delta_x = hidden_x - sensor_x
+            delta_y = hidden_y - sensor_y
+            hidden_dist = abs(delta_x) + abs(delta_y)
+            if hidden_dist > 1:
+                break
+        # put the beacon part of the way along a path from the sensor towards the hidden point, which keeps it inside
+        # the search area
+        dist = rng.randint(1, hidden_dist - 1)
+        step_x = rng.randint(max(0, dist - abs(delta_y)), min(dist, abs(delta_x)))
+        step_y = dist - step_x
+        beacon_x = sensor_x + step_x * (1 if delta_x >= 0 else -1)
+        beacon_y = sensor_y + step_y * (1 if delta_y >= 0 else -1)
+        file_obj.write(f'Sensor at x={sensor_x}, y={sensor_y}: closest beacon is at x={beacon_x}, y={beacon_y}\n')
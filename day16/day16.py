@@ -1,14 +1,20 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import profiling  # noqa: E402
+from common.cache import cached_input  # noqa: E402
 
 
 def day16a(input_path):
     """Return the maximum units of pressure that can be released in 30 minutes by opening a sequence of valves."""
-    valves = parse_input(input_path)
-    # we only care about opening valves that have a nonzero flow rate
-    valve_name_list = [name for name, valve in valves.items() if valve.rate > 0]
+    valve_name_list, evaluator = build_evaluator(input_path)
+    return max_pressure(valve_name_list, evaluator)
 
-    evaluator = Evaluator(valves, valve_name_list)
 
-    total_pressure_list = []
+def evaluate_sequences(valve_name_list, evaluator, max_time):
+    """Return a dict mapping each sequence of valves (as a tuple) worth checking to the total pressure it releases."""
+    total_pressure_map = {}
     # the total pressure released is a function of which valves are opened in what order, so we will calculate the total
     # pressure for various sequences of valves being opened, starting with sequences of length one
     next_sequences = [[name] for name in valve_name_list]
@@ -17,14 +23,30 @@ def day16a(input_path):
         # next round of sequences will be sequences that could be completed this round plus one additional valve
         next_sequences = []
         for sequence in sequences:
-            completed, total = evaluator.evaluate_valve_sequence(sequence)
+            completed, total = evaluator.evaluate_valve_sequence(sequence, max_time=max_time)
             if completed:
                 next_valve_choices = set(valve_name_list) - set(sequence)
                 next_sequences += [sequence + [next_valve] for next_valve in next_valve_choices]
-            total_pressure_list.append(total)
-    return max(total_pressure_list)
+            total_pressure_map[tuple(sequence)] = total
+    return total_pressure_map
+
 
+@profiling.timed('solve')
+def max_pressure(valve_name_list, evaluator):
+    """Return the maximum units of pressure that can be released in 30 minutes."""
+    return max(evaluate_sequences(valve_name_list, evaluator, max_time=30).values())
 
+
+@cached_input
+def build_evaluator(input_path):
+    """Return the names of valves with a nonzero flow rate and an Evaluator for the valves in the input file."""
+    valves = parse_input(input_path)
+    # we only care about opening valves that have a nonzero flow rate
+    valve_name_list = [name for name, valve in valves.items() if valve.rate > 0]
+    return valve_name_list, Evaluator(valves, valve_name_list)
+
+
+@profiling.timed('parse')
 def parse_input(input_path):
     """Parse the input file and return a dictionary of valve names to Valve objects."""
     valves = {}
@@ -57,6 +79,7 @@ class Valve:
 class DistanceMap:
     """Store dictionaries that allow quick lookup of minimum distances between pairs of valves."""
 
+    @profiling.timed('precompute')
     def __init__(self, valves, valve_name_list):
         self.from_map = dict()
         for valve_name in valve_name_list:
@@ -112,27 +135,15 @@ def test16a():
 
 def day16b(input_path):
     """Return the maximum units of pressure that can be released in 26 minutes by opening valves with help."""
-    valves = parse_input(input_path)
-    # we only care about opening valves that have a nonzero flow rate
-    valve_name_list = [name for name, valve in valves.items() if valve.rate > 0]
+    valve_name_list, evaluator = build_evaluator(input_path)
+    return max_pressure_with_help(valve_name_list, evaluator)
 
-    evaluator = Evaluator(valves, valve_name_list)
 
-    # this time, record all sequences checked with corresponding pressure released
-    total_pressure_map = {}
-    # the total pressure released is a function of which valves are opened in what order, so we will calculate the total
-    # pressure for various sequences of valves being opened, starting with sequences of length one
-    next_sequences = [[name] for name in valve_name_list]
-    while next_sequences:
-        sequences = next_sequences
-        # next round of sequences will be sequences that could be completed this round plus one additional valve
-        next_sequences = []
-        for sequence in sequences:
-            completed, total = evaluator.evaluate_valve_sequence(sequence, max_time=26)
-            if completed:
-                next_valve_choices = set(valve_name_list) - set(sequence)
-                next_sequences += [sequence + [next_valve] for next_valve in next_valve_choices]
-            total_pressure_map[tuple(sequence)] = total
+@profiling.timed('solve')
+def max_pressure_with_help(valve_name_list, evaluator):
+    """Return the maximum units of pressure that can be released in 26 minutes by two of us opening valves."""
+    # this time, use all sequences checked with corresponding pressure released
+    total_pressure_map = evaluate_sequences(valve_name_list, evaluator, max_time=26)
 
     # sort sequences from most to least pressure released
     pressure_list = sorted(total_pressure_map.items(), key=lambda x: x[1], reverse=True)
@@ -160,8 +171,19 @@ def test16b():
     assert 1707 == day16b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input and a single distance map."""
+    valve_name_list, evaluator = build_evaluator(input_path)
+    return max_pressure(valve_name_list, evaluator), max_pressure_with_help(valve_name_list, evaluator)
+
+
+def test_solve():
+    assert (1651, 1707) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test16a()
     print('Day 16a:', day16a('day16_input.txt'))
     test16b()
+    test_solve()
     print('Day 16b:', day16b('day16_input.txt'))
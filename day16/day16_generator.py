@@ -0,0 +1,41 @@
+import random
+import string
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'num_valves': 58 * scale}
+
+
+def generate(file_obj, seed=0, num_valves=58, num_nonzero=12, max_rate=25, extra_tunnels=20):
+    """Write a connected graph of valves and tunnels, one valve per line, starting from valve AA.
+
+    Valve names are two uppercase letters, so there can be at most 676 valves.
+    """
+    rng = random.Random(seed)
+    all_names = [a + b for a in string.ascii_uppercase for b in string.ascii_uppercase if a + b != 'AA']
+    if num_valves > len(all_names) + 1:
+        raise ValueError(f'Can generate at most {len(all_names) + 1} valves, but got {num_valves}.')
+    names = ['AA'] + rng.sample(all_names, num_valves - 1)
+    rates = {name: 0 for name in names}
+    for name in rng.sample(names[1:], min(num_nonzero, num_valves - 1)):
+        rates[name] = rng.randint(1, max_rate)
+
+    # a random spanning tree keeps the graph connected, and extra tunnels add some loops
+    connections = {name: set() for name in names}
+    for ind in range(1, num_valves):
+        other = names[rng.randrange(ind)]
+        connections[names[ind]].add(other)
+        connections[other].add(names[ind])
+    for _ in range(extra_tunnels if num_valves > 2 else 0):
+        first, second = rng.sample(names, 2)
+        connections[first].add(second)
+        connections[second].add(first)
+
+    for name in names:
+        others = sorted(connections[name])
+        if len(others) == 1:
+            tunnels = f'tunnel leads to valve {others[0]}'
+        else:
+            tunnels = f'tunnels lead to valves {", ".join(others)}'
+        file_obj.write(f'Valve {name} has flow rate={rates[name]}; {tunnels}\n')
@@ -1,9 +1,44 @@
 import itertools
+import os
+import sys
 
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import grid, profiling  # noqa: E402
+
 
 SHAPES = ('-', '+', 'L', '|', 'x')
+SIZES = {'-': (4, 1), '+': (3, 3), 'L': (3, 3), '|': (1, 4), 'x': (2, 2)}  # width and height of each shape
+ROOM_WIDTH = 9  # room is 7 units wide, but add 2 for the walls
+
+# offsets (rows up, columns right) from a rock's bottom left corner to the cells it fills
+ROCK_CELLS = {
+    '-': [(0, 0), (0, 1), (0, 2), (0, 3)],
+    '+': [(0, 1), (1, 0), (1, 1), (1, 2), (2, 1)],
+    'L': [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)],
+    '|': [(0, 0), (1, 0), (2, 0), (3, 0)],
+    'x': [(0, 0), (0, 1), (1, 0), (1, 1)],
+}
+# cells that must be empty before a rock can move one step in each direction
+LEFT_CHECKS = {shape: [(row, -1) for row in range(height)] for shape, (width, height) in SIZES.items()}
+LEFT_CHECKS['+'] = [(0, 0), (1, 0), (2, 0), (1, -1)]
+LEFT_CHECKS['L'] = [(0, 0), (1, 0), (2, 0), (0, -1)]
+RIGHT_CHECKS = {shape: [(row, width) for row in range(height)] for shape, (width, height) in SIZES.items()}
+RIGHT_CHECKS['+'] = [(0, 2), (1, 2), (2, 2), (1, 3)]
+DOWN_CHECKS = {shape: [(-1, col) for col in range(width)] for shape, (width, height) in SIZES.items()}
+DOWN_CHECKS['+'] = [(0, 0), (0, 1), (0, 2), (-1, 1)]
+
+
+def _flat_offsets(table):
+    return {shape: grid.flat_offsets(coords, (1, ROOM_WIDTH)) for shape, coords in table.items()}
+
+
+# the same tables as offsets into the room's flat array of cells, so each check is a single index per cell
+ROCK_OFFSETS = _flat_offsets(ROCK_CELLS)
+LEFT_OFFSETS = _flat_offsets(LEFT_CHECKS)
+RIGHT_OFFSETS = _flat_offsets(RIGHT_CHECKS)
+DOWN_OFFSETS = _flat_offsets(DOWN_CHECKS)
 
 
 def day17a(input_path):
@@ -13,6 +48,7 @@ def day17a(input_path):
     return room.max_height
 
 
+@profiling.timed('parse')
 def parse_input(input_path):
     """Return the string from the input file."""
     with open(input_path) as file_obj:
@@ -25,14 +61,7 @@ class Rock:
         if shape not in SHAPES:
             raise ValueError(f"Shape must be one of {SHAPES} but got {shape}.")
         self.shape = shape
-        size_map = {
-            '-': (4, 1),
-            '+': (3, 3),
-            'L': (3, 3),
-            '|': (1, 4),
-            'x': (2, 2),
-        }
-        self.width, self.height = size_map[shape]
+        self.width, self.height = SIZES[shape]
         self.left = 3  # rocks start two units away from the left wall
         self.bottom = max_room_height + 4  # rocks start three units above the highest rock or the floor
         self.stopped = False
@@ -43,24 +72,28 @@ class Rock:
 
 class Room:
 
+    @profiling.timed('precompute')
     def __init__(self, input_path, room_height=20):
         self.jets_iter = itertools.cycle(parse_input(input_path))
         self.shapes_iter = itertools.cycle(SHAPES)
-        room_width = 9  # room is 7 units wide, but add 2 for the walls
-        # the rock layout is represented by the array; 1 is fixed rock; 0 is empty space
-        self.array = np.zeros((room_height, room_width), int)
-        self.array[0, :] = 1  # make the floor solid rock
-        self.array[:, 0] = 1  # left wall
-        self.array[:, -1] = 1  # right wall
+        # the rock layout is stored row by row from the floor up in a flat array; 1 is fixed rock; 0 is empty space
+        self.cells = np.zeros(room_height * ROOM_WIDTH, np.uint8)
+        array = self.array
+        array[0, :] = 1  # make the floor solid rock
+        array[:, 0] = 1  # left wall
+        array[:, -1] = 1  # right wall
         self.max_height = 0  # keep track of max height of rock tower (0 for bare floor)
         self.num_rocks = 0  # keep track of the number of rocks that have fallen
 
+    @property
+    def array(self):
+        """The rock layout as a 2-D array (a view of the flat cells) with the floor in row 0."""
+        return self.cells.reshape(-1, ROOM_WIDTH)
+
     def __str__(self):
-        char_array = np.flipud(self.array).astype('U1')
-        char_array[char_array == '1'] = '#'
-        char_array[char_array == '0'] = '.'
-        return '\n'.join([''.join([char for char in row]) for row in char_array.tolist()])
+        return grid.to_text(np.flipud(self.array), '.#')
 
+    @profiling.timed('solve')
     def run_rock_sim(self, num_rocks):
         """Simulate the specified number of rocks falling in sequence."""
         for num_rock in range(num_rocks):
@@ -73,40 +106,25 @@ class Room:
                     self.push_rock_right(rock)
                 self.move_rock_down(rock)
 
+    def is_blocked(self, rock, offsets):
+        """Return True if any of the cells at the given offsets from the rock's bottom left corner is rock."""
+        cells = self.cells
+        corner = rock.bottom * ROOM_WIDTH + rock.left
+        for offset in offsets[rock.shape]:
+            if cells[corner + offset]:
+                return True
+        return False
+
     def push_rock_left(self, rock):
-        if rock.shape == '+':
-            check = np.append(
-                self.array[rock.bottom:rock.bottom + rock.height, rock.left],
-                self.array[rock.bottom + 1, rock.left - 1],
-            )
-        elif rock.shape == 'L':
-            check = np.append(
-                self.array[rock.bottom:rock.bottom + rock.height, rock.left],
-                self.array[rock.bottom, rock.left - 1],
-            )
-        else:
-            check = self.array[rock.bottom:rock.bottom + rock.height, rock.left - 1]
-        rock.left -= 1 * np.all(check == 0)
+        if not self.is_blocked(rock, LEFT_OFFSETS):
+            rock.left -= 1
 
     def push_rock_right(self, rock):
-        if rock.shape == '+':
-            check = np.append(
-                self.array[rock.bottom:rock.bottom + rock.height, rock.left + rock.width - 1],
-                self.array[rock.bottom + 1, rock.left + rock.width],
-            )
-        else:
-            check = self.array[rock.bottom:rock.bottom + rock.height, rock.left + rock.width]
-        rock.left += 1 * np.all(check == 0)
+        if not self.is_blocked(rock, RIGHT_OFFSETS):
+            rock.left += 1
 
     def move_rock_down(self, rock):
-        if rock.shape == '+':
-            check = np.append(
-                self.array[rock.bottom, rock.left:rock.left + rock.width],
-                self.array[rock.bottom - 1, rock.left + 1],
-            )
-        else:
-            check = self.array[rock.bottom - 1, rock.left:rock.left + rock.width]
-        if np.any(check):
+        if self.is_blocked(rock, DOWN_OFFSETS):
             self.freeze_rock(rock)
             return
         rock.bottom -= 1
@@ -115,14 +133,9 @@ class Room:
         """When a rock cannot fall further, indicate that it has stopped, and make it part of the room's fixed rock."""
         rock.stopped = True
         self.num_rocks += 1
-        if rock.shape in ('-', '|', 'x'):
-            self.array[rock.bottom:rock.bottom + rock.height, rock.left:rock.left + rock.width] = 1
-        elif rock.shape == '+':
-            self.array[rock.bottom + 1, rock.left:rock.left + rock.width] = 1
-            self.array[rock.bottom:rock.bottom + rock.height, rock.left + 1] = 1
-        elif rock.shape == 'L':
-            self.array[rock.bottom, rock.left:rock.left + rock.width] = 1
-            self.array[rock.bottom:rock.bottom + rock.height, rock.left + 2] = 1
+        corner = rock.bottom * ROOM_WIDTH + rock.left
+        for offset in ROCK_OFFSETS[rock.shape]:
+            self.cells[corner + offset] = 1
         self.max_height = max(self.max_height, rock.bottom + rock.height - 1)
 
 
@@ -137,7 +150,11 @@ def day17b(input_path):
     room = Room(input_path, room_height=2000 * 4)
     # run for some amount of time to warm up
     room.run_rock_sim(num_rocks=2000)
+    return extrapolate_height(room, desired_num_rocks)
 
+
+def extrapolate_height(room, desired_num_rocks):
+    """Return the tower height after the desired number of rocks by finding a repeating pattern in a warmed-up room."""
     # run for a bunch more steps
     max_heights = []
     # 40 is the length of the jet pattern in the test input, but it seems to work for the real input too
@@ -171,8 +188,23 @@ def test17b():
     assert 1514285714288 == day17b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single simulation.
+
+    The 2022 rocks of part 1 also serve as the warm-up before looking for the repeating pattern in part 2.
+    """
+    room = Room(input_path, room_height=2000 * 4)
+    room.run_rock_sim(num_rocks=2022)
+    return room.max_height, extrapolate_height(room, desired_num_rocks=1000000000000)
+
+
+def test_solve():
+    assert (3068, 1514285714288) == solve('test_input.txt')
+
+
 if __name__ == '__main__':
     test17a()
     print('Day 17a:', day17a('day17_input.txt'))
     test17b()
+    test_solve()
     print('Day 17b:', day17b('day17_input.txt'))
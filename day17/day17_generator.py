@@ -0,0 +1,17 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'length': 10091 * scale}
+
+
+def generate(file_obj, seed=0, length=10091, chunk_size=65536):
+    """Write a single line of '<' and '>' jet directions."""
+    rng = random.Random(seed)
+    written = 0
+    while written < length:
+        num = min(chunk_size, length - written)
+        file_obj.write(''.join(rng.choices('<>', k=num)))
+        written += num
+    file_obj.write('\n')
@@ -1,43 +1,28 @@
-import numpy as np
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from common import grid, parsing, profiling  # noqa: E402
 
+
+@profiling.timed('parse')
 def parse_input(input_path):
-    """Return a list of lists of cube coordinates."""
-    cube_list = []
-    with open(input_path) as file_obj:
-        for line in file_obj:
-            cube_list.append([int(num) for num in line.split(',')])
-    return cube_list
+    """Return an Nx3 array of cube coordinates."""
+    return parsing.read_ints(input_path, signed=False).reshape(-1, 3)
 
 
 def day18a(input_path):
     """Return the estimated surface area of the flying lava blobs."""
-    cube_list = parse_input(input_path)
-    cube_coords = np.array(cube_list)
-    # max possible area is 6 per cube
-    area = 6 * len(cube_list)
-
-    def count_adjacent(array):
-        deltas = np.diff(array, axis=0)
-        return np.all(deltas == np.array([1, 0, 0]), axis=1).sum()
-
-    # subtract 2 from max possible area for each adjacent cube
-    # need to check for adjacent cubes in 3 dimensions, so reorder columns and sort them three ways
-    inds = np.lexsort(cube_coords.T)
-    cube_coords = cube_coords[inds]
-    area -= 2 * count_adjacent(cube_coords)
-
-    cube_coords = np.roll(cube_coords, 1, axis=1)
-    inds = np.lexsort(cube_coords.T)
-    cube_coords = cube_coords[inds]
-    area -= 2 * count_adjacent(cube_coords)
+    cube_coords = parse_input(input_path)
+    return calc_surface_area(cube_coords)
 
-    cube_coords = np.roll(cube_coords, 1, axis=1)
-    inds = np.lexsort(cube_coords.T)
-    cube_coords = cube_coords[inds]
-    area -= 2 * count_adjacent(cube_coords)
 
-    return area
+@profiling.timed('solve')
+def calc_surface_area(cube_coords):
+    """Return the surface area of the cubes in an Nx3 array of cube coordinates, including any trapped air pockets."""
+    # max possible area is 6 per cube, less 2 for each pair of cubes that share a face
+    occupied, _ = grid.occupancy(cube_coords)
+    return 6 * len(cube_coords) - 2 * grid.count_adjacent_pairs(occupied)
 
 
 def test18a():
@@ -52,8 +37,19 @@ def test18b():
     assert 58 == day18b('test_input.txt')
 
 
+def solve(input_path):
+    """Return the answers to both parts from a single parse of the input (part 2 is not solved yet, so it is None)."""
+    cube_coords = parse_input(input_path)
+    return calc_surface_area(cube_coords), None
+
+
+def test_solve():
+    assert 64 == solve('test_input.txt')[0]
+
+
 if __name__ == '__main__':
     test18a()
+    test_solve()
     print('Day 18a:', day18a('day18_input.txt'))
     # test18b()
     # print('Day 18b:', day18b('day18_input.txt'))
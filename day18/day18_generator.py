@@ -0,0 +1,19 @@
+import random
+
+
+def scaled_knobs(scale):
+    """Return generator keyword arguments for an input `scale` times the size of the puzzle input."""
+    return {'size': round(20 * scale ** (1 / 3))}
+
+
+def generate(file_obj, seed=0, size=20, density=0.3):
+    """Write the coordinates of unique cubes in a size x size x size box, one 'x,y,z' cube per line.
+
+    Each position in the box is filled with probability `density`, so no cube is ever written twice.
+    """
+    rng = random.Random(seed)
+    for x in range(size):
+        for y in range(size):
+            for z in range(size):
+                if rng.random() < density:
+                    file_obj.write(f'{x},{y},{z}\n')
@@ -0,0 +1,32 @@
+import argparse
+import sys
+
+from common import days
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic puzzle input for one day.')
+    parser.add_argument('day', help='day to generate an input for')
+    parser.add_argument('output', help="file to write, or '-' for stdout")
+    parser.add_argument('--scale', type=int, default=1, help='size relative to the puzzle input')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--set', nargs=2, action='append', default=[], metavar=('KNOB', 'VALUE'),
+                        help='override a generator keyword argument with a number, e.g. --set num_elves 1000000')
+    args = parser.parse_args()
+
+    generator = days.load_generator(args.day)
+    if generator is None:
+        parser.error(f'No generator for day {args.day}.')
+    knobs = generator.scaled_knobs(args.scale)
+    for name, value in args.set:
+        knobs[name] = float(value) if '.' in value else int(value)
+
+    if args.output == '-':
+        generator.generate(sys.stdout, seed=args.seed, **knobs)
+    else:
+        with open(args.output, 'w') as file_obj:
+            generator.generate(file_obj, seed=args.seed, **knobs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import concurrent.futures
+import os
+import time
+
+from common import cache, days, profiling
+
+
+def init_worker(profile_options=None):
+    """Import numpy and all solver modules once per worker process, and turn on profiling if requested.
+
+    Profiling also turns off the parsed-input cache, so that the parse and precompute phases really run.
+    """
+    if profile_options is not None:
+        os.environ['AOC_NO_CACHE'] = '1'
+    import numpy  # noqa: F401
+    for day in days.list_days():
+        days.load_day(day)
+    if profile_options is not None:
+        profiling.enable(**profile_options)
+
+
+def run_part(day, part, input_path, cprofile_out=None):
+    """Run one part of one day and return a dict with the result, wall time, CPU time and any phase statistics.
+
+    If `cprofile_out` is given, the cProfile data for the captured phase is written to '<cprofile_out>.<day><part>'.
+    """
+    solver = days.get_solver(day, part)
+    profiling.reset()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = solver(input_path)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    record = {'day': day, 'part': part, 'result': result, 'wall': wall, 'cpu': cpu}
+    if profiling.is_enabled():
+        record['profile'] = profiling.get_stats()
+        if cprofile_out:
+            profiling.dump_cprofile(f'{cprofile_out}.{day}{part}')
+    return record
+
+
+def collect_tasks(day_list, input_dir=None):
+    """Return a list of (day, part, input_path) for every part that has a solver and an input file."""
+    tasks = []
+    for day in day_list:
+        day = days.format_day(day)
+        if input_dir:
+            path = os.path.join(input_dir, f'day{day}_input.txt')
+        else:
+            path = days.input_path(day)
+        if not os.path.isfile(path):
+            print(f'Skipping day {day}: no input at {path}')
+            continue
+        for part in days.PARTS:
+            if days.get_solver(day, part) is not None:
+                tasks.append((day, part, path))
+    return tasks
+
+
+def run_all(tasks, workers=None, profile_options=None, cprofile_out=None, use_cache=True, refresh_cache=False):
+    """Run all tasks over a process pool and return their results sorted by day and part.
+
+    Answers already in the on-disk result cache are returned without running the solver, and new answers are added to
+    it; `refresh_cache` solves everything again and overwrites the cached answers. Pass `profile_options` (keyword
+    arguments for profiling.enable) to collect phase statistics in the workers.
+    """
+    results = []
+    todo = []
+    for task in tasks:
+        day, part, input_path = task
+        found, answer = False, None
+        if use_cache and not refresh_cache:
+            found, answer = cache.get_result(day, part, days.module_path(day), input_path)
+        if found:
+            results.append({'day': day, 'part': part, 'result': answer, 'wall': 0.0, 'cpu': 0.0, 'cached': True})
+        else:
+            todo.append(task)
+    if not todo:
+        return sorted(results, key=lambda r: (r['day'], r['part']))
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=(profile_options,),
+    ) as executor:
+        futures = {executor.submit(run_part, *task, cprofile_out=cprofile_out): task for task in todo}
+        for future in concurrent.futures.as_completed(futures):
+            day, part, input_path = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as exc:
+                results.append({'day': day, 'part': part, 'result': None, 'wall': None, 'cpu': None, 'error': exc})
+                continue
+            if use_cache:
+                cache.put_result(day, part, days.module_path(day), input_path, results[-1]['result'])
+    return sorted(results, key=lambda r: (r['day'], r['part']))
+
+
+def format_results(results, total_wall):
+    """Return a table of results and timings as a string."""
+    lines = [f'{"day":>4} {"wall (s)":>10} {"cpu (s)":>10}  result']
+    for r in results:
+        name = f'{r["day"]}{r["part"]}'
+        if 'error' in r:
+            lines.append(f'{name:>4} {"-":>10} {"-":>10}  ERROR: {r["error"]!r}')
+            continue
+        result = r['result']
+        if isinstance(result, str) and '\n' in result:
+            result = '\n' + result.rstrip('\n')
+        if r.get('cached'):
+            lines.append(f'{name:>4} {"cached":>10} {"-":>10}  {result}')
+            continue
+        lines.append(f'{name:>4} {r["wall"]:>10.3f} {r["cpu"]:>10.3f}  {result}')
+    cpu_sum = sum(r['cpu'] for r in results if r['cpu'] is not None)
+    lines.append(f'total wall time: {total_wall:.3f} s (sum of part CPU times: {cpu_sum:.3f} s)')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all dayNN solvers in parallel and report timings.')
+    parser.add_argument('days', nargs='*', help='days to run (default: all)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes (default: cores)')
+    parser.add_argument('--input-dir', default=None, help='directory containing dayNN_input.txt files')
+    parser.add_argument('--no-cache', action='store_true', help='neither read nor store answers in the result cache')
+    parser.add_argument('--refresh-cache', action='store_true', help='solve again and overwrite cached answers')
+    parser.add_argument('--profile', action='store_true', help='report time and peak memory per solver phase')
+    parser.add_argument('--profile-json', default=None, help='also write the phase statistics to this JSON file')
+    parser.add_argument('--no-profile-memory', action='store_true', help='skip tracemalloc when profiling (faster)')
+    parser.add_argument('--cprofile', default=None, metavar='PHASE',
+                        help="capture a cProfile of one phase, e.g. 'solve' or 'day14.solve' (implies --profile)")
+    parser.add_argument('--cprofile-out', default='phase.prof',
+                        help='prefix for the cProfile files, one per day and part (default: phase.prof)')
+    args = parser.parse_args()
+
+    profile_options = None
+    if args.profile or args.profile_json or args.cprofile:
+        profile_options = {'memory': not args.no_profile_memory, 'cprofile_phase': args.cprofile}
+    tasks = collect_tasks(args.days or days.list_days(), input_dir=args.input_dir)
+    start = time.perf_counter()
+    results = run_all(
+        tasks, workers=args.workers, profile_options=profile_options,
+        cprofile_out=args.cprofile_out if args.cprofile else None,
+        # profiling needs the solvers to actually run, so it refreshes the result cache rather than reading it (and
+        # the workers skip the parsed-input cache)
+        use_cache=not args.no_cache, refresh_cache=args.refresh_cache or profile_options is not None,
+    )
+    print(format_results(results, time.perf_counter() - start))
+    if profile_options is not None:
+        phase_stats = {}
+        for r in results:
+            profiling.merge_stats(phase_stats, r.get('profile', {}))
+        print()
+        print(profiling.format_report(phase_stats))
+        if args.profile_json:
+            profiling.dump(args.profile_json, phase_stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import hashlib
+import http
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import urllib.parse
+
+from batch import to_jsonable
+from common import days
+from run_all import init_worker
+
+
+def solve_input(day, part, input_path):
+    """Run one part of a day (or 'both' for the day's solve function) in a worker and return the answer."""
+    if part == 'both':
+        return list(days.load_day(day).solve(input_path))
+    return days.get_solver(day, part)(input_path)
+
+
+class RequestError(Exception):
+    """Raised for a request the service cannot handle; carries the HTTP status to reply with."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class SolverService:
+    """Solves puzzle inputs over a process pool, caching answers and sharing work between identical requests.
+
+    Results are cached in memory by (day, part, SHA-256 of the input). A request that arrives while an identical one is
+    still being solved waits for that result instead of starting a second solve.
+    """
+
+    def __init__(self, workers=None, max_results=4096, spool_dir=None):
+        self.workers = workers or os.cpu_count()
+        self.max_results = max_results
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        # the solvers read files, so inputs sent in a request are written here, named by their digest
+        self.own_spool_dir = spool_dir is None
+        self.spool_dir = spool_dir or tempfile.mkdtemp(prefix='aoc-service-')
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.day_list = days.list_days()
+        self.results = collections.OrderedDict()  # (day, part, digest) --> answer, least recently used first
+        self.in_flight = {}  # (day, part, digest) --> task solving it
+        self.stats = collections.Counter()
+
+    async def warm_up(self):
+        """Start every worker process and import the solvers, so the first requests do not pay for it."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, days.list_days) for _ in range(self.workers)])
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        if self.own_spool_dir:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def check_request(self, day, part):
+        """Return the two-digit day, or raise RequestError if the day or part is not known."""
+        try:
+            day = days.format_day(day)
+        except ValueError:
+            raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown day '{day}'.")
+        if day not in self.day_list:
+            raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown day '{day}'.")
+        if part != 'both' and (part not in days.PARTS or days.get_solver(day, part) is None):
+            raise RequestError(http.HTTPStatus.NOT_FOUND, f"Unknown part '{part}' for day {day}.")
+        return day
+
+    async def solve(self, day, part, data):
+        """Return (answer, how) for an input given as bytes, where how is 'cached', 'coalesced' or 'solved'."""
+        day = self.check_request(day, part)
+        key = (day, part, hashlib.sha256(data).hexdigest())
+        self.stats['requests'] += 1
+        if key in self.results:
+            self.stats['cached'] += 1
+            self.results.move_to_end(key)
+            return self.results[key], 'cached'
+        if key in self.in_flight:
+            self.stats['coalesced'] += 1
+            how = 'coalesced'
+        else:
+            self.in_flight[key] = asyncio.ensure_future(self._solve_new(key, data))
+            how = 'solved'
+        # shield the shared task so that a client hanging up does not cancel it for everyone else waiting on it
+        return await asyncio.shield(self.in_flight[key]), how
+
+    async def _solve_new(self, key, data):
+        day, part, digest = key
+        try:
+            input_path = self._spool(digest, data)
+            loop = asyncio.get_running_loop()
+            answer = await loop.run_in_executor(self.executor, solve_input, day, part, input_path)
+            self.stats['solved'] += 1
+            self.results[key] = answer
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
+            return answer
+        finally:
+            del self.in_flight[key]
+
+    def _spool(self, digest, data):
+        path = os.path.join(self.spool_dir, f'{digest}.txt')
+        if not os.path.isfile(path):
+            # write to a temporary file first so that a worker never reads a partial input
+            fd, tmp_path = tempfile.mkstemp(dir=self.spool_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file_obj:
+                file_obj.write(data)
+            os.replace(tmp_path, path)
+        return path
+
+    async def route(self, method, target, body):
+        """Handle one request and return (status, JSON-serializable payload)."""
+        url = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qs(url.query)
+        parts = [p for p in url.path.split('/') if p]
+        if parts == ['health'] and method == 'GET':
+            return http.HTTPStatus.OK, {'status': 'ok', 'days': self.day_list}
+        if parts == ['stats'] and method == 'GET':
+            stats = dict(self.stats, cached_results=len(self.results), in_flight=len(self.in_flight))
+            return http.HTTPStatus.OK, stats
+        if len(parts) == 3 and parts[0] == 'solve' and method in ('GET', 'POST'):
+            _, day, part = parts
+            self.check_request(day, part)
+            if 'path' in query:
+                # solve a file that is already on this machine
+                try:
+                    with open(query['path'][0], 'rb') as file_obj:
+                        body = file_obj.read()
+                except OSError as exc:
+                    raise RequestError(http.HTTPStatus.BAD_REQUEST, f'Cannot read input: {exc}')
+            elif not body:
+                raise RequestError(http.HTTPStatus.BAD_REQUEST, 'Send the input as the request body or ?path=...')
+            start = time.perf_counter()
+            try:
+                answer, how = await self.solve(day, part, body)
+            except RequestError:
+                raise
+            except Exception as exc:
+                return http.HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(exc).__name__}: {exc}'}
+            payload = {'day': days.format_day(day), 'part': part, 'answer': answer, 'how': how}
+            payload['seconds'] = time.perf_counter() - start
+            return http.HTTPStatus.OK, payload
+        raise RequestError(http.HTTPStatus.NOT_FOUND, f'No route for {method} {url.path}')
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, keeping it open between requests unless asked to close it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                try:
+                    status, payload = await self.route(method, target, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {'error': str(exc)}
+                data = json.dumps(payload, default=to_jsonable).encode()
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = (
+                    f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                    f'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(data)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'
+                )
+                writer.write(head.encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # the client went away or sent something that is not HTTP
+        finally:
+            writer.close()
+
+
+async def serve(host='127.0.0.1', port=8022, unix_socket=None, workers=None, max_results=4096):
+    """Run the service until cancelled, listening on a TCP port on `host` or on a Unix socket."""
+    service = SolverService(workers=workers, max_results=max_results)
+    try:
+        await service.warm_up()
+        if unix_socket:
+            server = await asyncio.start_unix_server(service.handle_connection, path=unix_socket)
+            address = unix_socket
+        else:
+            server = await asyncio.start_server(service.handle_connection, host=host, port=port)
+            address = f'http://{host}:{port}'
+        print(f'Serving {len(service.day_list)} days with {service.workers} workers on {address}', file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if unix_socket and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the solvers over HTTP from a long-lived process.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8022, help='port to listen on (default: 8022)')
+    parser.add_argument('--unix-socket', default=None, help='listen on this Unix socket path instead of a TCP port')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of worker processes (default: cores)')
+    parser.add_argument('--max-results', type=int, default=4096, help='number of answers to keep cached')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix_socket, args.workers, args.max_results))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()